@@ -0,0 +1,39 @@
+"""Bulk-load helpers shared by the database providers."""
+
+import csv
+import io
+from typing import Iterable, List
+
+
+def postgres_copy_insert(table, conn, keys: List[str], data_iter: Iterable) -> int:
+    """Insert rows with PostgreSQL ``COPY ... FROM STDIN`` instead of parameterized INSERTs.
+
+    Intended as the ``method`` argument of :meth:`pandas.DataFrame.to_sql`; pandas
+    passes each chunk of rows through ``data_iter``.
+
+    Args:
+        table: pandas SQLTable being written
+        conn: SQLAlchemy connection wrapping a psycopg2 DBAPI connection
+        keys: Column names in insertion order
+        data_iter: Iterable of row tuples
+
+    Returns:
+        Number of rows copied
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    row_count = 0
+    for row in data_iter:
+        # NULL is spelled \N so empty strings still load as empty strings
+        writer.writerow(["\\N" if value is None else value for value in row])
+        row_count += 1
+    buffer.seek(0)
+
+    columns = ", ".join(f'"{key}"' for key in keys)
+    table_name = f'"{table.schema}"."{table.name}"' if table.schema else f'"{table.name}"'
+
+    dbapi_conn = conn.connection
+    with dbapi_conn.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT CSV, NULL '\\N')", buffer)
+
+    return row_count
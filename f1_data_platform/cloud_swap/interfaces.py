@@ -1,7 +1,7 @@
 """Cloud provider abstraction interfaces."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, IO
+from typing import Any, Dict, Iterator, List, Optional, IO
 import pandas as pd
 
 
@@ -68,8 +68,15 @@ class DatabaseProvider(ABC):
         pass
 
     @abstractmethod
-    def fetch_dataframe(self, query: str, params: Optional[Dict] = None) -> pd.DataFrame:
-        """Execute a query and return results as pandas DataFrame."""
+    def fetch_dataframe(self, query: str, params: Optional[Dict] = None,
+                        dtype: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """Execute a query and return results as pandas DataFrame, optionally with explicit column dtypes."""
+        pass
+
+    @abstractmethod
+    def fetch_dataframe_chunks(self, query: str, params: Optional[Dict] = None,
+                               chunksize: int = 200_000) -> Iterator[pd.DataFrame]:
+        """Execute a query and yield results as pandas DataFrames of at most chunksize rows."""
         pass
 
     @abstractmethod
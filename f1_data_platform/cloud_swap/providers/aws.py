@@ -1,7 +1,7 @@
 """AWS cloud provider implementation."""
 
 import os
-from typing import Any, Dict, List, Optional, IO
+from typing import Any, Dict, Iterator, List, Optional, IO
 import pandas as pd
 
 try:
@@ -14,6 +14,7 @@ except ImportError:
     AWS_AVAILABLE = False
 
 from ..interfaces import StorageProvider, DatabaseProvider, ComputeProvider, CloudProvider
+from ..bulk_load import postgres_copy_insert
 
 
 class AWSStorageProvider(StorageProvider):
@@ -171,16 +172,25 @@ class AWSRDSProvider(DatabaseProvider):
         with engine.connect() as conn:
             return conn.execute(query, params)
 
-    def fetch_dataframe(self, query: str, params: Optional[Dict] = None) -> pd.DataFrame:
+    def fetch_dataframe(self, query: str, params: Optional[Dict] = None,
+                        dtype: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
         """Execute a query and return results as pandas DataFrame."""
         engine = self.connect()
-        return pd.read_sql_query(query, engine, params=params)
+        return pd.read_sql_query(query, engine, params=params, dtype=dtype)
+
+    def fetch_dataframe_chunks(self, query: str, params: Optional[Dict] = None,
+                               chunksize: int = 200_000) -> Iterator[pd.DataFrame]:
+        """Execute a query and yield results in DataFrame chunks using a server-side cursor."""
+        engine = self.connect()
+        with engine.connect().execution_options(stream_results=True) as conn:
+            yield from pd.read_sql_query(query, conn, params=params, chunksize=chunksize)
 
     def insert_dataframe(self, df: pd.DataFrame, table_name: str, if_exists: str = "append") -> bool:
         """Insert a pandas DataFrame into a database table."""
         try:
             engine = self.connect()
-            df.to_sql(table_name, engine, if_exists=if_exists, index=False)
+            df.to_sql(table_name, engine, if_exists=if_exists, index=False,
+                      method=postgres_copy_insert)
             return True
         except Exception:
             return False
@@ -3,7 +3,7 @@
 import os
 import json
 import time
-from typing import Any, Dict, List, Optional, IO
+from typing import Any, Dict, Iterator, List, Optional, IO
 import pandas as pd
 from datetime import datetime
 
@@ -316,44 +316,59 @@ class AthenaIcebergProvider(DatabaseProvider):
             results.extend(result)
         return results
 
-    def fetch_dataframe(self, query: str, params: Optional[Dict] = None) -> pd.DataFrame:
+    def _fetch_query_result_body(self, query: str, params: Optional[Dict] = None) -> Any:
+        """Run an Athena query and return a streaming body over its CSV result."""
+        # Replace parameters if provided
+        if params:
+            for key, value in params.items():
+                query = query.replace(f":{key}", str(value))
+        
+        # Submit query
+        response = self.athena_client.start_query_execution(
+            QueryString=query,
+            QueryExecutionContext={'Database': self.database},
+            ResultConfiguration={
+                'OutputLocation': f's3://{self.results_bucket}/dataframes/'
+            },
+            WorkGroup=self.workgroup
+        )
+        
+        query_execution_id = response['QueryExecutionId']
+        self._wait_for_query_completion(query_execution_id)
+        
+        # Get results location
+        execution_details = self.athena_client.get_query_execution(
+            QueryExecutionId=query_execution_id
+        )
+        
+        result_location = execution_details['QueryExecution']['ResultConfiguration']['OutputLocation']
+        result_key = result_location.replace(f's3://{self.results_bucket}/', '')
+        result_obj = self.s3_client.get_object(Bucket=self.results_bucket, Key=result_key)
+        return result_obj['Body']
+
+    def fetch_dataframe(self, query: str, params: Optional[Dict] = None,
+                        dtype: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
         """Execute query and return results as DataFrame."""
         try:
-            # Replace parameters if provided
-            if params:
-                for key, value in params.items():
-                    query = query.replace(f":{key}", str(value))
-            
-            # Submit query
-            response = self.athena_client.start_query_execution(
-                QueryString=query,
-                QueryExecutionContext={'Database': self.database},
-                ResultConfiguration={
-                    'OutputLocation': f's3://{self.results_bucket}/dataframes/'
-                },
-                WorkGroup=self.workgroup
-            )
-            
-            query_execution_id = response['QueryExecutionId']
-            self._wait_for_query_completion(query_execution_id)
-            
-            # Get results location
-            execution_details = self.athena_client.get_query_execution(
-                QueryExecutionId=query_execution_id
-            )
-            
-            result_location = execution_details['QueryExecution']['ResultConfiguration']['OutputLocation']
-            
             # Download and parse CSV results
             import io
-            result_key = result_location.replace(f's3://{self.results_bucket}/', '')
-            result_obj = self.s3_client.get_object(Bucket=self.results_bucket, Key=result_key)
-            
-            return pd.read_csv(io.StringIO(result_obj['Body'].read().decode('utf-8')))
+            body = self._fetch_query_result_body(query, params)
+            return pd.read_csv(io.StringIO(body.read().decode('utf-8')), dtype=dtype)
             
         except Exception as e:
             raise RuntimeError(f"DataFrame query failed: {e}")
 
+    def fetch_dataframe_chunks(self, query: str, params: Optional[Dict] = None,
+                               chunksize: int = 200_000) -> Iterator[pd.DataFrame]:
+        """Execute query and stream the CSV results as DataFrame chunks."""
+        try:
+            body = self._fetch_query_result_body(query, params)
+            with pd.read_csv(body, chunksize=chunksize) as reader:
+                yield from reader
+                
+        except Exception as e:
+            raise RuntimeError(f"DataFrame query failed: {e}")
+
     def insert_dataframe(self, df: pd.DataFrame, table_name: str, if_exists: str = "append") -> bool:
         """Insert DataFrame into Iceberg table via Athena."""
         try:
@@ -1,7 +1,7 @@
 """Azure cloud provider implementation."""
 
 import os
-from typing import Any, Dict, List, Optional, IO
+from typing import Any, Dict, Iterator, List, Optional, IO
 import pandas as pd
 
 try:
@@ -213,7 +213,7 @@ class AzureDatabaseProvider(DatabaseProvider):
                 self.connection = pyodbc.connect(self.connection_string)
             
             if self.engine is None:
-                self.engine = create_engine(self.sqlalchemy_url)
+                self.engine = create_engine(self.sqlalchemy_url, fast_executemany=True)
             
             return self.connection
         except Exception as e:
@@ -255,24 +255,36 @@ class AzureDatabaseProvider(DatabaseProvider):
         finally:
             cursor.close()
 
-    def fetch_dataframe(self, query: str, params: Optional[Dict] = None) -> pd.DataFrame:
+    def fetch_dataframe(self, query: str, params: Optional[Dict] = None,
+                        dtype: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
         """Execute a query and return results as pandas DataFrame."""
         self.connect()
         
         try:
             if params:
-                return pd.read_sql(query, self.engine, params=params)
+                return pd.read_sql(query, self.engine, params=params, dtype=dtype)
             else:
-                return pd.read_sql(query, self.engine)
+                return pd.read_sql(query, self.engine, dtype=dtype)
         except Exception as e:
             raise RuntimeError(f"Failed to fetch DataFrame: {e}")
 
+    def fetch_dataframe_chunks(self, query: str, params: Optional[Dict] = None,
+                               chunksize: int = 200_000) -> Iterator[pd.DataFrame]:
+        """Execute a query and yield results in DataFrame chunks."""
+        self.connect()
+        
+        try:
+            with self.engine.connect().execution_options(stream_results=True) as conn:
+                yield from pd.read_sql(query, conn, params=params, chunksize=chunksize)
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch DataFrame chunks: {e}")
+
     def insert_dataframe(self, df: pd.DataFrame, table_name: str, if_exists: str = "append") -> bool:
         """Insert a pandas DataFrame into a database table."""
         self.connect()
         
         try:
-            df.to_sql(table_name, self.engine, if_exists=if_exists, index=False, method='multi')
+            df.to_sql(table_name, self.engine, if_exists=if_exists, index=False)
             return True
         except Exception:
             return False
@@ -4,7 +4,7 @@ import os
 import shutil
 import sqlite3
 from pathlib import Path
-from typing import Any, Dict, List, Optional, IO
+from typing import Any, Dict, Iterator, List, Optional, IO
 import pandas as pd
 
 from ..interfaces import StorageProvider, DatabaseProvider, ComputeProvider, CloudProvider
@@ -148,10 +148,17 @@ class LocalDatabaseProvider(DatabaseProvider):
         conn = self.connect()
         return conn.executemany(query, params)
 
-    def fetch_dataframe(self, query: str, params: Optional[Dict] = None) -> pd.DataFrame:
+    def fetch_dataframe(self, query: str, params: Optional[Dict] = None,
+                        dtype: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
         """Execute a query and return results as pandas DataFrame."""
         conn = self.connect()
-        return pd.read_sql_query(query, conn, params=params)
+        return pd.read_sql_query(query, conn, params=params, dtype=dtype)
+
+    def fetch_dataframe_chunks(self, query: str, params: Optional[Dict] = None,
+                               chunksize: int = 200_000) -> Iterator[pd.DataFrame]:
+        """Execute a query and yield results in DataFrame chunks."""
+        conn = self.connect()
+        yield from pd.read_sql_query(query, conn, params=params, chunksize=chunksize)
 
     def insert_dataframe(self, df: pd.DataFrame, table_name: str, if_exists: str = "append") -> bool:
         """Insert a pandas DataFrame into a database table."""
@@ -177,7 +184,7 @@ class LocalDatabaseProvider(DatabaseProvider):
     def table_exists(self, table_name: str) -> bool:
         """Check if a table exists in the database."""
         try:
-            query = "SELECT name FROM sqlite_master WHERE type='table' AND name=?"
+            query = "SELECT name FROM sqlite_master WHERE type='table' AND name=:name"
             result = self.execute_query(query, {"name": table_name}).fetchone()
             return result is not None
         except Exception:
@@ -11,6 +11,71 @@ from ..config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Column dtypes for raw endpoint files, matching the Spark read schemas in
+# glue-scripts/raw_data_processor.py. Pandas infers int64 for a column without
+# nulls and float64 for the same column with NaN, so without a fixed map two
+# raw files of one endpoint can disagree on type. Nullable dtypes keep integers
+# integral when values are missing.
+RAW_DTYPES = {
+    "meetings": {
+        "meeting_key": "Int64",
+        "meeting_name": "string",
+        "meeting_official_name": "string",
+        "location": "string",
+        "country_key": "Int64",
+        "country_code": "string",
+        "country_name": "string",
+        "circuit_key": "Int64",
+        "circuit_short_name": "string",
+        "date_start": "string",
+        "year": "Int64",
+        "gmt_offset": "string"
+    },
+    "sessions": {
+        "session_key": "Int64",
+        "session_name": "string",
+        "session_type": "string",
+        "date_start": "string",
+        "date_end": "string",
+        "gmt_offset": "string",
+        "meeting_key": "Int64"
+    },
+    "drivers": {
+        "driver_number": "Int64",
+        "broadcast_name": "string",
+        "full_name": "string",
+        "name_acronym": "string",
+        "team_name": "string",
+        "team_colour": "string",
+        "first_name": "string",
+        "last_name": "string",
+        "headshot_url": "string",
+        "country_code": "string",
+        "session_key": "Int64"
+    },
+    "laps": {
+        "date_start": "string",
+        "session_key": "Int64",
+        "driver_number": "Int64",
+        "lap_number": "Int64",
+        "lap_duration": "float64",
+        "lap_time": "float64",
+        "i1_speed": "float64",
+        "i2_speed": "float64",
+        "st_speed": "float64",
+        "is_personal_best": "boolean",
+        "compound": "string",
+        "tyre_life": "Int64",
+        "fresh_tyre": "boolean"
+    },
+    "position": {
+        "date": "string",
+        "session_key": "Int64",
+        "driver_number": "Int64",
+        "position": "Int64"
+    }
+}
+
 
 class DataExtractor:
     """Orchestrates data extraction from OpenF1 API to cloud storage."""
@@ -65,9 +130,11 @@ class DataExtractor:
                     record_count = len(dataframe)
                     logger.info(f"Extracted {record_count} records from {endpoint_name} for year {year}")
                     
+                    dataframe = self._apply_raw_dtypes(endpoint_name, dataframe)
+                    
                     # Save raw data to storage if requested
                     if save_raw and record_count > 0:
-                        raw_path = f"raw_data/year={year}/endpoint={endpoint_name}/data_{extraction_timestamp}.parquet"
+                        raw_path = f"raw-data/year={year}/endpoint={endpoint_name}/data_{extraction_timestamp}.parquet"
                         success = self.storage.upload_dataframe(dataframe, raw_path, format="parquet")
                         if success:
                             stats["files_saved"] += 1
@@ -156,6 +223,24 @@ class DataExtractor:
             logger.error(f"Error extracting incremental data from {endpoint_name}: {e}")
             return pd.DataFrame()
 
+    @staticmethod
+    def _apply_raw_dtypes(endpoint_name: str, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Cast an endpoint's columns to their fixed raw dtypes.
+        
+        Columns the payload didn't include are left absent rather than added,
+        and endpoints or columns without an entry in RAW_DTYPES are unchanged.
+        
+        Args:
+            endpoint_name: Name of the endpoint the data came from
+            dataframe: Extracted data
+            
+        Returns:
+            DataFrame with the known columns cast
+        """
+        dtypes = RAW_DTYPES.get(endpoint_name, {})
+        present = {column: dtype for column, dtype in dtypes.items() if column in dataframe.columns}
+        return dataframe.astype(present) if present else dataframe
+
     def _save_to_database(self, dataframe: pd.DataFrame, table_name: str) -> bool:
         """Save dataframe to database.
         
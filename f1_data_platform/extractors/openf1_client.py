@@ -1,5 +1,6 @@
 """OpenF1 API client for data extraction."""
 
+import threading
 import time
 import requests
 from typing import Dict, List, Any, Optional, Generator
@@ -8,6 +9,18 @@ import pandas as pd
 from dataclasses import dataclass, field
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -146,6 +159,27 @@ class OpenF1Client:
             "User-Agent": "F1-Pipeline/1.0.0",
             "Accept": "application/json"
         })
+        
+        # Worker threads get their own sessions (see _get_session)
+        self._owner_thread = threading.current_thread()
+        self._thread_local = threading.local()
+
+    def _get_session(self) -> requests.Session:
+        """Return the HTTP session for the calling thread.
+        
+        requests.Session isn't guaranteed thread-safe, so threads other than
+        the one that created the client get their own session with the same
+        headers. This lets callers fan requests out over a thread pool.
+        """
+        if threading.current_thread() is self._owner_thread:
+            return self.session
+        
+        session = getattr(self._thread_local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.session.headers)
+            self._thread_local.session = session
+        return session
 
     def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a request to the OpenF1 API with retry logic.
@@ -172,10 +206,10 @@ class OpenF1Client:
                 
                 logger.debug(f"Making request to {url} with params {params} (attempt {attempt + 1})")
                 
-                response = self.session.get(url, params=params, timeout=self.timeout)
+                response = self._get_session().get(url, params=params, timeout=self.timeout)
                 response.raise_for_status()
                 
-                return response.json()
+                return self._parse_json(response)
                 
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Request failed (attempt {attempt + 1}/{self.max_retries + 1}): {e}")
@@ -184,6 +218,34 @@ class OpenF1Client:
                     raise
                 continue
 
+    @staticmethod
+    def _parse_json(response: requests.Response) -> Any:
+        """Decode a JSON response body, using orjson when it is installed."""
+        if ORJSON_AVAILABLE and isinstance(response.content, bytes):
+            return orjson.loads(response.content)
+        return response.json()
+
+    @staticmethod
+    def _records_to_dataframe(records: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Build a DataFrame from API records.
+        
+        Goes through a columnar Arrow table when pyarrow is available, which is
+        considerably faster than pandas' row-by-row dict conversion for large
+        responses. Fields are inferred across all records, since OpenF1 leaves
+        optional fields out of some rows. Falls back to pandas when a field
+        mixes incompatible types across records, or when any field holds lists
+        or objects (e.g. lap segments), which Arrow would hand back as numpy
+        arrays instead of the Python values pandas keeps.
+        """
+        if PYARROW_AVAILABLE:
+            try:
+                struct_array = pa.array(records)
+                if not any(pa.types.is_nested(field.type) for field in struct_array.type):
+                    return pa.Table.from_struct_array(struct_array).to_pandas()
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                logger.debug("Mixed-type records; falling back to pandas conversion")
+        return pd.DataFrame(records)
+
     def get_data(self, endpoint_name: str, params: Optional[Dict[str, Any]] = None,
                  as_dataframe: bool = True) -> Any:
         """Get data from a specific endpoint.
@@ -203,7 +265,7 @@ class OpenF1Client:
         data = self._make_request(endpoint.url_path, params)
         
         if as_dataframe and data:
-            df = pd.DataFrame(data)
+            df = self._records_to_dataframe(data)
             # Add metadata columns
             df["_extracted_at"] = datetime.utcnow()
             df["_endpoint"] = endpoint_name
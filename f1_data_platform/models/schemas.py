@@ -295,6 +295,20 @@ class SchemaManager:
         }
     }
     
+    # Composite (session_key, driver_number) lookup indexes for the raw tables
+    # read per session/driver by the analytics transformer. The trailing
+    # columns are the ones those lookups read, so the index covers the query
+    # without needing INCLUDE (which SQLite does not support).
+    RAW_LOOKUP_INDEXES = {
+        "raw_laps": ["lap_duration", "is_pit_out_lap"],
+        "raw_pit": ["pit_duration"],
+        "raw_car_data": ["speed", "throttle", "brake"],
+        "raw_stints": ["compound", "stint_number"],
+        "raw_session_result": ["position", "dnf", "dns", "dsq"],
+        "raw_drivers": ["full_name", "name_acronym", "team_name"],
+        "raw_starting_grid": ["position"]
+    }
+    
     @classmethod
     def get_all_schemas(cls) -> Dict[str, Dict[str, str]]:
         """Get all schema definitions."""
@@ -373,6 +387,17 @@ class SchemaManager:
         
         return indexes
     
+    @classmethod
+    def get_lookup_indexes_sql(cls) -> Dict[str, str]:
+        """Generate covering (session_key, driver_number) index SQL for raw tables."""
+        return {
+            table_name: (
+                f"CREATE INDEX IF NOT EXISTS idx_{table_name}_session_driver "
+                f"ON {table_name}({', '.join(['session_key', 'driver_number'] + covered_columns)})"
+            )
+            for table_name, covered_columns in cls.RAW_LOOKUP_INDEXES.items()
+        }
+    
     @classmethod
     def validate_schema(cls, table_name: str, data_dict: Dict[str, Any]) -> List[str]:
         """Validate data against schema and return list of validation errors."""
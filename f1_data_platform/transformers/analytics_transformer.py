@@ -1,12 +1,16 @@
 """Data transformation pipeline for F1 analytics."""
 
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from multiprocessing import Manager
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import pandas as pd
 import json
 
-from ..cloud_swap import CloudProvider
+from ..cloud_swap import CloudProvider, CloudProviderFactory
 from ..models.schemas import SchemaManager
 from ..config.settings import Settings
 
@@ -28,6 +32,7 @@ class DataTransformer:
         self.storage = cloud_provider.get_storage_provider()
         self.database = cloud_provider.get_database_provider()
         self.schema_manager = SchemaManager()
+        self.write_semaphore = None
 
     def setup_analytics_tables(self) -> Dict[str, bool]:
         """Create analytics layer tables in the database.
@@ -58,6 +63,34 @@ class DataTransformer:
                 logger.error(f"Failed to create analytics table {table_name}: {e}")
                 results[table_name] = False
         
+        # Per-session/driver lookups read the raw tables
+        self.ensure_raw_indexes()
+        
+        return results
+
+    def ensure_raw_indexes(self) -> Dict[str, bool]:
+        """Create covering (session_key, driver_number) indexes on raw tables.
+        
+        Tables that have not been loaded yet are skipped.
+        
+        Returns:
+            Dictionary mapping raw table names to index creation success status
+        """
+        results = {}
+        
+        for table_name, index_sql in self.schema_manager.get_lookup_indexes_sql().items():
+            if not self.database.table_exists(table_name):
+                logger.debug(f"Skipping lookup index for missing table: {table_name}")
+                continue
+            
+            try:
+                self.database.execute_query(index_sql)
+                results[table_name] = True
+                logger.info(f"Created lookup index on {table_name}")
+            except Exception as e:
+                logger.error(f"Failed to create lookup index on {table_name}: {e}")
+                results[table_name] = False
+        
         return results
 
     def transform_grand_prix_results(self, year: int) -> pd.DataFrame:
@@ -74,13 +107,19 @@ class DataTransformer:
         try:
             # Get race sessions for the year
             race_sessions_query = """
-                SELECT s.*, m.meeting_name, m.circuit_short_name, m.date_start as race_date
+                SELECT s.session_key, s.meeting_key, m.meeting_name, m.circuit_short_name,
+                       m.date_start as race_date,
+                       ROW_NUMBER() OVER (ORDER BY s.date_start) AS race_round
                 FROM raw_sessions s
                 JOIN raw_meetings m ON s.meeting_key = m.meeting_key
-                WHERE s.year = ? AND s.session_type = 'Race'
+                WHERE s.year = :year AND s.session_type = 'Race'
                 ORDER BY s.date_start
             """
-            race_sessions = self.database.fetch_dataframe(race_sessions_query, {"year": year})
+            race_sessions = self.database.fetch_dataframe(
+                race_sessions_query,
+                {"year": year},
+                dtype={"session_key": "int64", "meeting_key": "int64", "race_round": "int64"}
+            )
             
             if race_sessions.empty:
                 logger.warning(f"No race sessions found for year {year}")
@@ -111,60 +150,64 @@ class DataTransformer:
                 # Get penalties (from race control)
                 penalties = self._get_penalties(session_key)
                 
-                # Merge all data
-                for _, result in session_results.iterrows():
-                    driver_number = result["driver_number"]
-                    
-                    # Get driver info
-                    driver_info = drivers[drivers["driver_number"] == driver_number]
-                    if driver_info.empty:
-                        continue
-                    driver_info = driver_info.iloc[0]
-                    
-                    # Get starting position
-                    start_pos = starting_grid[starting_grid["driver_number"] == driver_number]
-                    starting_position = start_pos.iloc[0]["position"] if not start_pos.empty else None
-                    
-                    # Get fastest lap
-                    fast_lap = fastest_laps[fastest_laps["driver_number"] == driver_number]
-                    fastest_lap_time = fast_lap.iloc[0]["lap_duration"] if not fast_lap.empty else None
-                    
-                    # Get penalties
-                    driver_penalties = penalties[penalties["driver_number"] == driver_number]
-                    total_penalty = driver_penalties["penalty_seconds"].sum() if not driver_penalties.empty else 0
-                    
-                    # Calculate points (F1 2019-2023 point system)
-                    points = self._calculate_points(result["position"], fastest_lap_time is not None and result["position"] <= 10)
-                    
-                    # Create result record
-                    result_record = {
-                        "result_id": f"{year}_{session['race_round']}_{driver_number}",
-                        "date": session["race_date"],
-                        "year": year,
-                        "grand_prix": session["meeting_name"],
-                        "circuit_name": session["circuit_short_name"],
-                        "driver_number": driver_number,
-                        "driver_name": driver_info["full_name"],
-                        "driver_acronym": driver_info["name_acronym"],
-                        "team_name": driver_info["team_name"],
-                        "starting_grid_position": starting_position,
-                        "final_position": result["position"],
-                        "points": points,
-                        "fastest_lap": fastest_lap_time,
-                        "total_time_penalty": total_penalty,
-                        "dnf": result.get("dnf", False),
-                        "dns": result.get("dns", False),
-                        "dsq": result.get("dsq", False),
-                        "created_at": datetime.utcnow()
-                    }
-                    
-                    results.append(result_record)
+                # Merge all data with hashed lookups on driver_number; the
+                # first row per driver wins, as with the previous scalar lookups
+                driver_info = drivers.drop_duplicates("driver_number").set_index("driver_number")
+                start_positions = (
+                    starting_grid.drop_duplicates("driver_number")
+                    .set_index("driver_number")["position"]
+                    .rename("starting_grid_position")
+                )
+                fastest_lap_times = fastest_laps.set_index("driver_number")["lap_duration"].rename("fastest_lap")
+                driver_penalties = (
+                    penalties.groupby("driver_number")["penalty_seconds"].sum()
+                    .astype(float)
+                    .rename("total_time_penalty")
+                )
+                
+                merged = (
+                    session_results.join(driver_info, on="driver_number", how="inner")
+                    .join(start_positions, on="driver_number")
+                    .join(fastest_lap_times, on="driver_number")
+                    .join(driver_penalties, on="driver_number")
+                )
+                if merged.empty:
+                    continue
+                
+                # Calculate points (F1 2019-2023 point system)
+                has_fastest_lap = merged["fastest_lap"].notna() & (merged["position"] <= 10)
+                points = [
+                    self._calculate_points(position, fastest)
+                    for position, fastest in zip(merged["position"], has_fastest_lap)
+                ]
+                
+                # Create result records
+                results.append(pd.DataFrame({
+                    "result_id": f"{year}_{session['race_round']}_" + merged["driver_number"].astype(str),
+                    "date": session["race_date"],
+                    "year": year,
+                    "grand_prix": session["meeting_name"],
+                    "circuit_name": session["circuit_short_name"],
+                    "driver_number": merged["driver_number"],
+                    "driver_name": merged["full_name"],
+                    "driver_acronym": merged["name_acronym"],
+                    "team_name": merged["team_name"],
+                    "starting_grid_position": merged["starting_grid_position"],
+                    "final_position": merged["position"],
+                    "points": points,
+                    "fastest_lap": merged["fastest_lap"],
+                    "total_time_penalty": merged["total_time_penalty"].fillna(0),
+                    "dnf": merged.get("dnf", False),
+                    "dns": merged.get("dns", False),
+                    "dsq": merged.get("dsq", False),
+                    "created_at": datetime.utcnow()
+                }))
             
             if not results:
                 logger.warning(f"No results generated for year {year}")
                 return pd.DataFrame()
             
-            results_df = pd.DataFrame(results)
+            results_df = pd.concat(results, ignore_index=True)
             
             # Calculate championship context
             results_df = self._add_championship_context(results_df)
@@ -193,7 +236,7 @@ class DataTransformer:
                 SELECT s.*, m.meeting_name, m.circuit_short_name
                 FROM raw_sessions s
                 JOIN raw_meetings m ON s.meeting_key = m.meeting_key
-                WHERE s.year = ?
+                WHERE s.year = :year
                 ORDER BY s.date_start
             """
             sessions = self.database.fetch_dataframe(sessions_query, {"year": year})
@@ -283,101 +326,107 @@ class DataTransformer:
         logger.info(f"Transforming championship standings for year {year}")
         
         try:
-            # Get all Grand Prix results for the year, ordered by date
-            results_query = """
-                SELECT * FROM grand_prix_results
-                WHERE year = ?
-                ORDER BY date, final_position
+            # Cumulative points, wins and positions are computed with window
+            # functions so the database does the per-race aggregation instead
+            # of pulling every result row into pandas. Drivers stay in the
+            # standings from their first race onwards, even if they miss one.
+            standings_query = """
+                WITH races AS (
+                    SELECT date, grand_prix,
+                           ROW_NUMBER() OVER (ORDER BY date, grand_prix) AS race_round
+                    FROM grand_prix_results
+                    WHERE year = :year
+                    GROUP BY date, grand_prix
+                ),
+                entrants AS (
+                    SELECT driver_number, driver_name, team_name, first_round, first_position
+                    FROM (
+                        SELECT r.driver_number, r.driver_name, r.team_name,
+                               ra.race_round AS first_round,
+                               r.final_position AS first_position,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY r.driver_number
+                                   ORDER BY ra.race_round, r.final_position
+                               ) AS appearance
+                        FROM grand_prix_results r
+                        JOIN races ra ON ra.date = r.date AND ra.grand_prix = r.grand_prix
+                        WHERE r.year = :year
+                    ) appearances
+                    WHERE appearance = 1
+                ),
+                race_points AS (
+                    SELECT ra.race_round, ra.grand_prix AS after_race,
+                           e.driver_number, e.driver_name, e.team_name,
+                           e.first_round, e.first_position,
+                           COALESCE(SUM(r.points), 0) AS race_points,
+                           SUM(CASE WHEN r.final_position = 1 THEN 1 ELSE 0 END) AS race_wins,
+                           SUM(CASE WHEN r.final_position <= 3 THEN 1 ELSE 0 END) AS race_podiums,
+                           SUM(CASE WHEN r.points > 0 THEN 1 ELSE 0 END) AS race_points_finishes
+                    FROM races ra
+                    JOIN entrants e ON e.first_round <= ra.race_round
+                    LEFT JOIN grand_prix_results r
+                        ON r.year = :year
+                        AND r.date = ra.date
+                        AND r.grand_prix = ra.grand_prix
+                        AND r.driver_number = e.driver_number
+                    GROUP BY ra.race_round, ra.grand_prix, e.driver_number, e.driver_name,
+                             e.team_name, e.first_round, e.first_position
+                ),
+                cumulative AS (
+                    SELECT race_round, after_race, driver_number, driver_name, team_name,
+                           first_round, first_position,
+                           SUM(race_points) OVER (
+                               PARTITION BY driver_number ORDER BY race_round
+                               ROWS UNBOUNDED PRECEDING
+                           ) AS points,
+                           SUM(race_wins) OVER (
+                               PARTITION BY driver_number ORDER BY race_round
+                               ROWS UNBOUNDED PRECEDING
+                           ) AS wins,
+                           SUM(race_podiums) OVER (
+                               PARTITION BY driver_number ORDER BY race_round
+                               ROWS UNBOUNDED PRECEDING
+                           ) AS podiums,
+                           SUM(race_points_finishes) OVER (
+                               PARTITION BY driver_number ORDER BY race_round
+                               ROWS UNBOUNDED PRECEDING
+                           ) AS points_finishes
+                    FROM race_points
+                ),
+                ranked AS (
+                    SELECT c.*,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY race_round
+                               ORDER BY points DESC, first_round, first_position
+                           ) AS position,
+                           MAX(points) OVER (PARTITION BY race_round) AS leader_points
+                    FROM cumulative c
+                )
+                SELECT race_round, after_race, driver_number, driver_name, team_name,
+                       position, points,
+                       leader_points - points AS points_behind_leader,
+                       COALESCE(
+                           points - LEAD(points) OVER (PARTITION BY race_round ORDER BY position),
+                           0
+                       ) AS points_ahead_next,
+                       wins, podiums, points_finishes
+                FROM ranked
+                ORDER BY race_round, position
             """
-            results = self.database.fetch_dataframe(results_query, {"year": year})
+            standings_df = self.database.fetch_dataframe(standings_query, {"year": year})
             
-            if results.empty:
+            if standings_df.empty:
                 logger.warning(f"No Grand Prix results found for year {year}")
                 return pd.DataFrame()
             
-            # Group by race and calculate cumulative standings
-            standings_records = []
-            races = results.groupby(["date", "grand_prix"]).first().reset_index()
-            
-            cumulative_points = {}  # driver_number -> points
-            
-            for race_idx, race in races.iterrows():
-                race_results = results[
-                    (results["date"] == race["date"]) & 
-                    (results["grand_prix"] == race["grand_prix"])
-                ]
-                
-                # Update cumulative points
-                for _, result in race_results.iterrows():
-                    driver_number = result["driver_number"]
-                    if driver_number not in cumulative_points:
-                        cumulative_points[driver_number] = 0
-                    cumulative_points[driver_number] += result["points"]
-                
-                # Create standings for this race
-                race_standings = []
-                for driver_number, total_points in cumulative_points.items():
-                    # Get driver info from results
-                    driver_info = results[results["driver_number"] == driver_number].iloc[0]
-                    
-                    # Calculate wins and podiums up to this point
-                    driver_results = results[
-                        (results["driver_number"] == driver_number) & 
-                        (results["date"] <= race["date"])
-                    ]
-                    
-                    wins = len(driver_results[driver_results["final_position"] == 1])
-                    podiums = len(driver_results[driver_results["final_position"] <= 3])
-                    points_finishes = len(driver_results[driver_results["points"] > 0])
-                    
-                    race_standings.append({
-                        "driver_number": driver_number,
-                        "driver_name": driver_info["driver_name"],
-                        "team_name": driver_info["team_name"],
-                        "points": total_points,
-                        "wins": wins,
-                        "podiums": podiums,
-                        "points_finishes": points_finishes
-                    })
-                
-                # Sort by points (descending) and assign positions
-                race_standings.sort(key=lambda x: x["points"], reverse=True)
-                
-                leader_points = race_standings[0]["points"] if race_standings else 0
-                
-                for position, standing in enumerate(race_standings, 1):
-                    points_behind_leader = leader_points - standing["points"]
-                    
-                    # Points ahead of next driver
-                    points_ahead_next = 0
-                    if position < len(race_standings):
-                        points_ahead_next = standing["points"] - race_standings[position]["points"]
-                    
-                    standing_record = {
-                        "standing_id": f"{year}_{race_idx + 1}_{standing['driver_number']}",
-                        "year": year,
-                        "race_round": race_idx + 1,
-                        "after_race": race["grand_prix"],
-                        "driver_number": standing["driver_number"],
-                        "driver_name": standing["driver_name"],
-                        "team_name": standing["team_name"],
-                        "position": position,
-                        "points": standing["points"],
-                        "points_behind_leader": points_behind_leader,
-                        "points_ahead_next": points_ahead_next,
-                        "wins": standing["wins"],
-                        "podiums": standing["podiums"],
-                        "points_finishes": standing["points_finishes"],
-                        "created_at": datetime.utcnow()
-                    }
-                    
-                    standings_records.append(standing_record)
-            
-            if not standings_records:
-                logger.warning(f"No championship standings generated for year {year}")
-                return pd.DataFrame()
+            standings_df.insert(0, "year", year)
+            standings_df.insert(
+                0,
+                "standing_id",
+                f"{year}_" + standings_df["race_round"].astype(str) + "_" + standings_df["driver_number"].astype(str)
+            )
+            standings_df["created_at"] = datetime.utcnow()
             
-            standings_df = pd.DataFrame(standings_records)
             logger.info(f"Generated {len(standings_df)} championship standings records for year {year}")
             return standings_df
             
@@ -402,7 +451,7 @@ class DataTransformer:
         try:
             gp_results = self.transform_grand_prix_results(year)
             if not gp_results.empty:
-                success = self.database.insert_dataframe(gp_results, "grand_prix_results", if_exists="append")
+                success = self._insert_analytics_data(gp_results, "grand_prix_results")
                 results["grand_prix_results"] = success
                 if success:
                     logger.info(f"Saved {len(gp_results)} Grand Prix results for year {year}")
@@ -416,7 +465,7 @@ class DataTransformer:
         try:
             gp_performance = self.transform_grand_prix_performance(year)
             if not gp_performance.empty:
-                success = self.database.insert_dataframe(gp_performance, "grand_prix_performance", if_exists="append")
+                success = self._insert_analytics_data(gp_performance, "grand_prix_performance")
                 results["grand_prix_performance"] = success
                 if success:
                     logger.info(f"Saved {len(gp_performance)} performance records for year {year}")
@@ -431,7 +480,7 @@ class DataTransformer:
             try:
                 standings = self.transform_championship_standings(year)
                 if not standings.empty:
-                    success = self.database.insert_dataframe(standings, "driver_championship_standings", if_exists="append")
+                    success = self._insert_analytics_data(standings, "driver_championship_standings")
                     results["driver_championship_standings"] = success
                     if success:
                         logger.info(f"Saved {len(standings)} championship standings for year {year}")
@@ -445,41 +494,101 @@ class DataTransformer:
         
         return results
 
+    def save_analytics_data_years(self, years: List[int], workers: Optional[int] = None,
+                                  max_db_writers: Optional[int] = None) -> Dict[int, Dict[str, bool]]:
+        """Transform and save analytics data for several years in parallel.
+        
+        Each year is processed in its own worker process with its own
+        DataTransformer and database connection.
+        
+        Args:
+            years: Years to process
+            workers: Number of worker processes (defaults to the CPU count)
+            max_db_writers: Maximum number of workers writing to the database
+                at the same time. Defaults to 1 for the local SQLite database,
+                which only allows one writer at a time, and to unlimited for
+                server databases
+            
+        Returns:
+            Dictionary mapping each year to its save_analytics_data result
+        """
+        if not years:
+            return {}
+        
+        if max_db_writers is None and self.settings.database.provider == "local":
+            max_db_writers = 1
+        
+        workers = min(workers or os.cpu_count() or 1, len(years))
+        logger.info(f"Saving analytics data for years {years} using {workers} worker processes")
+        
+        results = {}
+        with Manager() as manager:
+            write_semaphore = manager.Semaphore(max_db_writers) if max_db_writers else None
+            
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    year: executor.submit(
+                        _save_analytics_data_for_year, self.settings, self.cloud_provider.config,
+                        year, write_semaphore
+                    )
+                    for year in years
+                }
+                
+                for year, future in futures.items():
+                    try:
+                        results[year] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error saving analytics data for year {year}: {e}")
+                        results[year] = {
+                            "grand_prix_results": False,
+                            "grand_prix_performance": False,
+                            "driver_championship_standings": False
+                        }
+        
+        return results
+
     # Helper methods
     
+    def _insert_analytics_data(self, df: pd.DataFrame, table_name: str) -> bool:
+        """Insert analytics data, holding the shared write semaphore if one is set."""
+        with self.write_semaphore or nullcontext():
+            return self.database.insert_dataframe(df, table_name, if_exists="append")
+    
     def _get_session_results(self, session_key: int) -> pd.DataFrame:
         """Get session results for a specific session."""
         query = """
-            SELECT * FROM raw_session_result 
-            WHERE session_key = ?
+            SELECT driver_number, position, dnf, dns, dsq
+            FROM raw_session_result 
+            WHERE session_key = :session_key
             ORDER BY position
         """
-        return self.database.fetch_dataframe(query, {"session_key": session_key})
+        return self.database.fetch_dataframe(query, {"session_key": session_key}, dtype={"driver_number": "int64"})
     
     def _get_session_drivers(self, session_key: int) -> pd.DataFrame:
         """Get drivers for a specific session."""
         query = """
             SELECT DISTINCT driver_number, full_name, name_acronym, team_name
             FROM raw_drivers 
-            WHERE session_key = ?
+            WHERE session_key = :session_key
         """
         return self.database.fetch_dataframe(query, {"session_key": session_key})
     
     def _get_starting_grid(self, session_key: int) -> pd.DataFrame:
         """Get starting grid positions for a session."""
         query = """
-            SELECT * FROM raw_starting_grid 
-            WHERE session_key = ?
+            SELECT driver_number, position
+            FROM raw_starting_grid 
+            WHERE session_key = :session_key
             ORDER BY position
         """
-        return self.database.fetch_dataframe(query, {"session_key": session_key})
+        return self.database.fetch_dataframe(query, {"session_key": session_key}, dtype={"driver_number": "int64"})
     
     def _get_fastest_laps(self, session_key: int) -> pd.DataFrame:
         """Get fastest laps for each driver in a session."""
         query = """
             SELECT driver_number, MIN(lap_duration) as lap_duration
             FROM raw_laps 
-            WHERE session_key = ? AND lap_duration IS NOT NULL
+            WHERE session_key = :session_key AND lap_duration IS NOT NULL
             GROUP BY driver_number
         """
         return self.database.fetch_dataframe(query, {"session_key": session_key})
@@ -537,7 +646,7 @@ class DataTransformer:
         query = """
             SELECT lap_duration 
             FROM raw_laps 
-            WHERE session_key = ? AND driver_number = ? 
+            WHERE session_key = :session_key AND driver_number = :driver_number 
             AND lap_duration IS NOT NULL
             AND is_pit_out_lap = 0
         """
@@ -556,7 +665,7 @@ class DataTransformer:
         query = """
             SELECT pit_duration 
             FROM raw_pit 
-            WHERE session_key = ? AND driver_number = ?
+            WHERE session_key = :session_key AND driver_number = :driver_number
         """
         pits = self.database.fetch_dataframe(query, {"session_key": session_key, "driver_number": driver_number})
         
@@ -570,27 +679,30 @@ class DataTransformer:
     
     def _calculate_telemetry_aggregates(self, session_key: int, driver_number: int) -> Dict[str, Any]:
         """Calculate telemetry aggregates for a driver."""
+        # Car telemetry can run to millions of rows per session, so aggregate
+        # in the database and only transfer a single summary row.
         query = """
-            SELECT speed, throttle, brake 
+            SELECT COUNT(*) AS samples,
+                   AVG(speed) AS avg_speed,
+                   MAX(speed) AS max_speed,
+                   AVG(throttle) AS avg_throttle,
+                   SUM(CASE WHEN brake > 0 THEN 1 ELSE 0 END) AS braking_samples
             FROM raw_car_data 
-            WHERE session_key = ? AND driver_number = ?
+            WHERE session_key = :session_key AND driver_number = :driver_number
             AND speed IS NOT NULL
         """
         telemetry = self.database.fetch_dataframe(query, {"session_key": session_key, "driver_number": driver_number})
         
-        if telemetry.empty:
+        if telemetry.empty or not telemetry.iloc[0]["samples"]:
             return {}
         
-        # Calculate braking percentage
-        braking_time = len(telemetry[telemetry["brake"] > 0]) if "brake" in telemetry.columns else 0
-        total_time = len(telemetry)
-        braking_pct = (braking_time / total_time * 100) if total_time > 0 else 0
+        totals = telemetry.iloc[0]
         
         return {
-            "avg_speed": telemetry["speed"].mean(),
-            "max_speed": telemetry["speed"].max(),
-            "avg_throttle": telemetry["throttle"].mean() if "throttle" in telemetry.columns else None,
-            "time_spent_braking_pct": braking_pct
+            "avg_speed": totals["avg_speed"],
+            "max_speed": totals["max_speed"],
+            "avg_throttle": totals["avg_throttle"],
+            "time_spent_braking_pct": totals["braking_samples"] / totals["samples"] * 100
         }
     
     def _calculate_tire_performance(self, session_key: int, driver_number: int) -> Dict[str, Any]:
@@ -598,7 +710,7 @@ class DataTransformer:
         query = """
             SELECT compound, stint_number 
             FROM raw_stints 
-            WHERE session_key = ? AND driver_number = ?
+            WHERE session_key = :session_key AND driver_number = :driver_number
         """
         stints = self.database.fetch_dataframe(query, {"session_key": session_key, "driver_number": driver_number})
         
@@ -608,4 +720,21 @@ class DataTransformer:
         return {
             "compounds_used": stints["compound"].unique().tolist(),
             "stint_count": len(stints)
-        }
\ No newline at end of file
+        }
+
+
+def _save_analytics_data_for_year(settings: Settings, provider_config: Dict[str, Any], year: int,
+                                  write_semaphore: Any = None) -> Dict[str, bool]:
+    """Process-pool entry point that saves analytics data for a single year.
+    
+    The worker's cloud provider is built from the parent's provider config so
+    it writes to the same storage and database.
+    """
+    cloud_provider = CloudProviderFactory.create(settings.environment, provider_config)
+    transformer = DataTransformer(settings, cloud_provider)
+    transformer.write_semaphore = write_semaphore
+    
+    try:
+        return transformer.save_analytics_data(year)
+    finally:
+        transformer.database.close()
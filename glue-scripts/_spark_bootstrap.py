@@ -0,0 +1,74 @@
+"""
+Shared Spark bootstrap for the F1 Iceberg Glue jobs.
+
+Builds one SparkContext/SparkSession per JVM with the Iceberg Glue catalog,
+S3FileIO, AQE and serializer settings every Iceberg job uses, so the jobs
+stay consistently configured and reuse an existing session when one is
+already running. Ship alongside the job scripts via --extra-py-files.
+"""
+
+from typing import Dict, Optional
+from pyspark import SparkConf
+from pyspark.context import SparkContext
+from pyspark.sql import SparkSession
+
+def iceberg_spark_config(data_lake_bucket: str) -> Dict[str, str]:
+    """Return the Spark settings shared by all Iceberg processing jobs."""
+
+    return {
+        # Iceberg catalog backed by Glue, data files on S3
+        "spark.sql.extensions": "org.apache.iceberg.spark.extensions.IcebergSparkSessionExtensions",
+        "spark.sql.catalog.glue_catalog": "org.apache.iceberg.spark.SparkCatalog",
+        "spark.sql.catalog.glue_catalog.warehouse": f"s3://{data_lake_bucket}/iceberg-tables/",
+        "spark.sql.catalog.glue_catalog.catalog-impl": "org.apache.iceberg.aws.glue.GlueCatalog",
+        "spark.sql.catalog.glue_catalog.io-impl": "org.apache.iceberg.aws.s3.S3FileIO",
+        "spark.sql.catalog.glue_catalog.http-client.apache.max-connections": "1000",
+
+        # Adaptive query execution with generous initial shuffle parallelism
+        "spark.sql.adaptive.enabled": "true",
+        "spark.sql.adaptive.coalescePartitions.enabled": "true",
+        "spark.sql.shuffle.partitions": "4096",
+        "spark.sql.adaptive.coalescePartitions.initialPartitionNum": "4096",
+        "spark.sql.adaptive.advisoryPartitionSizeInBytes": "134217728",
+        "spark.sql.adaptive.coalescePartitions.minPartitionSize": "4194304",
+
+        # Broadcast dimension-sized tables (meetings, drivers) instead of
+        # sort-merge joining them against laps/position; AQE re-plans joins
+        # whose runtime size falls under the adaptive threshold
+        "spark.sql.autoBroadcastJoinThreshold": "52428800",
+        "spark.sql.adaptive.autoBroadcastJoinThreshold": "52428800",
+
+        # Kryo with registered row/cache classes so shuffled and cached blocks
+        # don't carry class names per record
+        "spark.serializer": "org.apache.spark.serializer.KryoSerializer",
+        "spark.kryo.registrationRequired": "false",
+        "spark.kryo.unsafe": "true",
+        "spark.kryo.referenceTracking": "false",
+        "spark.kryo.classesToRegister": (
+            "org.apache.spark.sql.catalyst.expressions.UnsafeRow,"
+            "org.apache.spark.sql.execution.columnar.DefaultCachedBatch"
+        ),
+    }
+
+def build_spark(args: Dict[str, str], extra_config: Optional[Dict[str, str]] = None) -> SparkSession:
+    """
+    Get or create the Iceberg-enabled SparkSession for a Glue job.
+
+    Static settings (extensions, serializer, catalogs) only take effect when
+    the SparkContext is created, so they are applied through the SparkConf
+    used to create it rather than on an already-running session.
+
+    Args:
+        args: Resolved Glue job arguments; must include DATA_LAKE_BUCKET
+        extra_config: Job-specific settings layered over the shared ones
+
+    Returns:
+        Configured SparkSession
+    """
+    settings = iceberg_spark_config(args['DATA_LAKE_BUCKET'])
+    settings.update(extra_config or {})
+
+    conf = SparkConf().setAll(list(settings.items()))
+    SparkContext.getOrCreate(conf)
+
+    return SparkSession.builder.config(conf=conf).getOrCreate()
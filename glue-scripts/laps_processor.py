@@ -12,8 +12,9 @@ Key Functions:
 """
 
 import sys
-from pyspark.context import SparkContext
-from pyspark.sql import SparkSession, DataFrame
+from datetime import date
+from pyspark import StorageLevel
+from pyspark.sql import DataFrame
 from pyspark.sql.functions import *
 from pyspark.sql.types import *
 from awsglue.context import GlueContext
@@ -21,6 +22,8 @@ from awsglue.job import Job
 from awsglue.utils import getResolvedOptions
 import logging
 
+from _spark_bootstrap import build_spark
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,22 +37,14 @@ args = getResolvedOptions(sys.argv, [
 ])
 
 # Initialize Spark with Iceberg support and performance optimizations
-sc = SparkContext()
-glue_context = GlueContext(sc)
-
-spark = SparkSession.builder \
-    .config("spark.sql.extensions", "org.apache.iceberg.spark.extensions.IcebergSparkSessionExtensions") \
-    .config("spark.sql.catalog.glue_catalog", "org.apache.iceberg.spark.SparkCatalog") \
-    .config("spark.sql.catalog.glue_catalog.warehouse", f"s3://{args['DATA_LAKE_BUCKET']}/iceberg-tables/") \
-    .config("spark.sql.catalog.glue_catalog.catalog-impl", "org.apache.iceberg.aws.glue.GlueCatalog") \
-    .config("spark.sql.catalog.glue_catalog.io-impl", "org.apache.iceberg.aws.s3.S3FileIO") \
-    .config("spark.sql.adaptive.enabled", "true") \
-    .config("spark.sql.adaptive.coalescePartitions.enabled", "true") \
-    .config("spark.sql.adaptive.skewJoin.enabled", "true") \
-    .config("spark.serializer", "org.apache.spark.serializer.KryoSerializer") \
-    .config("spark.dynamicAllocation.enabled", "true") \
-    .config("spark.dynamicAllocation.maxExecutors", "20") \
-    .getOrCreate()
+spark = build_spark(args, {
+    "spark.sql.adaptive.skewJoin.enabled": "true",
+    "spark.sql.adaptive.skewJoin.skewedPartitionFactor": "5",
+    "spark.sql.sources.partitionOverwriteMode": "dynamic",
+    "spark.dynamicAllocation.enabled": "true",
+    "spark.dynamicAllocation.maxExecutors": "20",
+})
+glue_context = GlueContext(spark.sparkContext)
 
 job = Job(glue_context)
 job.init(args['JOB_NAME'], args)
@@ -58,10 +53,31 @@ job.init(args['JOB_NAME'], args)
 DATABASE_NAME = args['DATABASE_NAME']
 DATA_LAKE_BUCKET = args['DATA_LAKE_BUCKET']
 ENVIRONMENT = args['ENVIRONMENT']
+# Full-table statistics scans run in dev, elsewhere only with --EMIT_STATS true
+EMIT_STATS = ENVIRONMENT == 'dev' or (
+    '--EMIT_STATS' in sys.argv
+    and getResolvedOptions(sys.argv, ['EMIT_STATS'])['EMIT_STATS'].lower() == 'true'
+)
 TABLE_NAME = f"glue_catalog.{DATABASE_NAME}.f1_laps"
+# Merged partitions are compacted only once this many of their data files fall
+# below the small-file size
+SMALL_FILE_BYTES = 33554432
+SMALL_FILE_THRESHOLD = 100
+
+def get_laps_watermark():
+    """Return the latest processing_timestamp already in the laps table, or None on first run."""
+    
+    try:
+        return spark.sql(f"""
+            SELECT MAX(processing_timestamp) AS max_processed
+            FROM {TABLE_NAME}
+        """).first()['max_processed']
+    except Exception as e:
+        logger.info(f"No laps watermark available, reading full history: {str(e)}")
+        return None
 
 def read_processed_laps_data() -> DataFrame:
-    """Read processed F1 laps data from S3."""
+    """Read processed F1 laps data from S3, limited to rows not yet merged into the table."""
     
     input_path = f"s3://{DATA_LAKE_BUCKET}/processed-data/laps/"
     
@@ -70,11 +86,20 @@ def read_processed_laps_data() -> DataFrame:
         
         df = spark.read.parquet(input_path)
         
-        if df.count() == 0:
+        watermark = get_laps_watermark()
+        if watermark is not None:
+            logger.info(f"Reading laps processed after {watermark}")
+            # The MERGE commits source rows atomically, so anything processed at
+            # or before the newest merged timestamp is already in the table.
+            # No date_start cutoff: reprocessed or backfilled laps from older
+            # race dates still carry a newer processing_timestamp
+            df = df.filter(col("processing_timestamp") > lit(watermark))
+        
+        if not df.head(1):
             logger.warning("No laps data found")
             return None
             
-        logger.info(f"Successfully read laps data with {df.count()} records")
+        logger.info("Successfully read laps data")
         return df
         
     except Exception as e:
@@ -85,45 +110,59 @@ def create_laps_iceberg_table() -> None:
     """Create the F1 laps Iceberg table with optimal partitioning."""
     
     try:
-        existing_tables = spark.sql(f"SHOW TABLES IN glue_catalog.{DATABASE_NAME}").collect()
-        table_exists = any(row['tableName'] == 'f1_laps' for row in existing_tables)
+        logger.info("Ensuring F1 laps Iceberg table exists with date partitioning...")
+        
+        create_table_sql = f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+            session_key bigint,
+            driver_number int,
+            lap_number int,
+            lap_duration double,
+            lap_time double,
+            i1_speed double,
+            i2_speed double,
+            st_speed double,
+            is_personal_best boolean,
+            compound string,
+            tyre_life int,
+            fresh_tyre boolean,
+            processing_timestamp timestamp,
+            date_start date
+        ) USING ICEBERG
+        PARTITIONED BY (date_start)
+        TBLPROPERTIES (
+            'format-version'='2',
+            'write.parquet.compression-codec'='zstd',
+            'write.parquet.compression-level'='3',
+            'write.metadata.delete-after-commit.enabled'='true',
+            'write.metadata.previous-versions-max'='3',
+            'write.target-file-size-bytes'='134217728',
+            'write.parquet.row-group-size-bytes'='134217728',
+            'write.parquet.page-size-bytes'='1048576',
+            'write.parquet.dict-size-bytes'='2097152',
+            'write.object-storage.enabled'='true'
+        )
+        """
+        
+        spark.sql(create_table_sql)
+        
+        # Keeps tables created before these write properties were added in line:
+        # ZSTD, 128 MB row groups and hashed object-store paths
+        spark.sql(f"""
+        ALTER TABLE {TABLE_NAME} SET TBLPROPERTIES (
+            'write.parquet.compression-codec'='zstd',
+            'write.parquet.compression-level'='3',
+            'write.parquet.row-group-size-bytes'='134217728',
+            'write.parquet.page-size-bytes'='1048576',
+            'write.parquet.dict-size-bytes'='2097152',
+            'write.object-storage.enabled'='true'
+        )
+        """)
+        # MERGE output is hash-distributed by date_start (Iceberg's default), so
+        # each partition gets one writer rather than one per join task
+        spark.sql(f"ALTER TABLE {TABLE_NAME} UNSET TBLPROPERTIES IF EXISTS ('write.distribution-mode')")
+        logger.info("F1 laps Iceberg table is ready")
         
-        if not table_exists:
-            logger.info("Creating F1 laps Iceberg table with date partitioning...")
-            
-            create_table_sql = f"""
-            CREATE TABLE {TABLE_NAME} (
-                session_key bigint,
-                driver_number int,
-                lap_number int,
-                lap_duration double,
-                lap_time double,
-                i1_speed double,
-                i2_speed double,
-                st_speed double,
-                is_personal_best boolean,
-                compound string,
-                tyre_life int,
-                fresh_tyre boolean,
-                processing_timestamp timestamp,
-                date_start date
-            ) USING ICEBERG
-            PARTITIONED BY (date_start)
-            TBLPROPERTIES (
-                'format-version'='2',
-                'write.parquet.compression-codec'='snappy',
-                'write.metadata.delete-after-commit.enabled'='true',
-                'write.metadata.previous-versions-max'='3',
-                'write.target-file-size-bytes'='134217728',
-                'write.parquet.row-group-size-bytes'='8388608'
-            )
-            """
-            
-            spark.sql(create_table_sql)
-            logger.info("F1 laps Iceberg table created successfully")
-        else:
-            logger.info("F1 laps Iceberg table already exists")
-            
     except Exception as e:
         logger.error(f"Error creating laps Iceberg table: {str(e)}")
         raise
@@ -133,6 +172,8 @@ def validate_and_clean_laps_data(df: DataFrame) -> DataFrame:
     
     logger.info("Validating and cleaning laps data...")
     
+    # Cache the input so the counts below don't rescan S3
+    df = df.persist(StorageLevel.MEMORY_AND_DISK)
     initial_count = df.count()
     
     # Remove duplicates based on unique lap identifier
@@ -147,8 +188,8 @@ def validate_and_clean_laps_data(df: DataFrame) -> DataFrame:
         col("date_start").isNotNull() &
         
         # Reasonable value ranges
-        col("lap_number") > 0 &
-        col("lap_number") < 200 &  # Max laps in any session
+        (col("lap_number") > 0) &
+        (col("lap_number") < 200) &  # Max laps in any session
         col("driver_number").between(1, 99) &
         
         # Lap time validations (if present)
@@ -167,134 +208,157 @@ def validate_and_clean_laps_data(df: DataFrame) -> DataFrame:
     # Add data quality score based on completeness
     df_clean = df_clean.withColumn("data_completeness_score",
         (
-            when(col("lap_time").isNotNull(), 0.3).otherwise(0.0) +
-            when(col("i1_speed").isNotNull(), 0.2).otherwise(0.0) +
-            when(col("i2_speed").isNotNull(), 0.2).otherwise(0.0) +
-            when(col("st_speed").isNotNull(), 0.2).otherwise(0.0) +
-            when(col("compound").isNotNull(), 0.1).otherwise(0.0)
+            col("lap_time").isNotNull().cast("double") * 0.3 +
+            col("i1_speed").isNotNull().cast("double") * 0.2 +
+            col("i2_speed").isNotNull().cast("double") * 0.2 +
+            col("st_speed").isNotNull().cast("double") * 0.2 +
+            col("compound").isNotNull().cast("double") * 0.1
         )
     )
     
+    df_clean = df_clean.persist(StorageLevel.MEMORY_AND_DISK)
     final_count = df_clean.count()
+    df.unpersist()
     logger.info(f"Data validation: {initial_count} -> {final_count} records "
                f"(removed {initial_count - final_count} invalid records)")
     
     return df_clean
 
 def process_laps_in_batches(df: DataFrame) -> None:
-    """Process laps data in batches by date partition for better performance."""
+    """Merge all date partitions of the laps data in a single Iceberg commit."""
     
     try:
-        # Get distinct dates for batch processing
-        dates_df = df.select("date_start").distinct().orderBy("date_start")
-        date_partitions = [row["date_start"] for row in dates_df.collect()]
+        # Bound the target scan to the incoming date range; Iceberg only prunes
+        # partitions from literal predicates, not from the join condition
+        bounds = df.agg(min("date_start").alias("min_date"),
+                        max("date_start").alias("max_date")).first()
+        if bounds['min_date'] is None:
+            logger.warning("No laps to merge after validation")
+            return
         
-        logger.info(f"Processing {len(date_partitions)} date partitions")
+        logger.info(f"Merging laps data for dates {bounds['min_date']} to {bounds['max_date']}...")
         
-        for date_partition in date_partitions:
-            try:
-                # Process one date partition at a time
-                partition_df = df.filter(col("date_start") == date_partition)
-                partition_count = partition_df.count()
-                
-                logger.info(f"Processing {partition_count} laps for date: {date_partition}")
-                
-                # Create temporary view for merge operation
-                partition_df.createOrReplaceTempView("laps_updates")
-                
-                # Perform merge operation for this partition
-                merge_sql = f"""
-                MERGE INTO {TABLE_NAME} target
-                USING laps_updates source
-                ON target.session_key = source.session_key 
-                   AND target.driver_number = source.driver_number 
-                   AND target.lap_number = source.lap_number
-                   AND target.date_start = source.date_start
-                WHEN MATCHED THEN 
-                    UPDATE SET 
-                        lap_duration = source.lap_duration,
-                        lap_time = source.lap_time,
-                        i1_speed = source.i1_speed,
-                        i2_speed = source.i2_speed,
-                        st_speed = source.st_speed,
-                        is_personal_best = source.is_personal_best,
-                        compound = source.compound,
-                        tyre_life = source.tyre_life,
-                        fresh_tyre = source.fresh_tyre,
-                        processing_timestamp = source.processing_timestamp
-                WHEN NOT MATCHED THEN 
-                    INSERT (
-                        session_key, driver_number, lap_number, lap_duration, lap_time,
-                        i1_speed, i2_speed, st_speed, is_personal_best, compound,
-                        tyre_life, fresh_tyre, processing_timestamp, date_start
-                    ) VALUES (
-                        source.session_key, source.driver_number, source.lap_number, 
-                        source.lap_duration, source.lap_time, source.i1_speed, 
-                        source.i2_speed, source.st_speed, source.is_personal_best, 
-                        source.compound, source.tyre_life, source.fresh_tyre, 
-                        source.processing_timestamp, source.date_start
-                    )
-                """
-                
-                spark.sql(merge_sql)
-                
-                logger.info(f"Successfully processed partition for date: {date_partition}")
-                
-            except Exception as e:
-                logger.error(f"Error processing partition {date_partition}: {str(e)}")
-                continue
+        # Create temporary view for merge operation
+        df.createOrReplaceTempView("laps_updates")
         
-        # Optimize table after all batches
-        logger.info("Optimizing laps table layout...")
-        optimize_sql = f"OPTIMIZE {TABLE_NAME}"
-        spark.sql(optimize_sql)
+        # One MERGE covers every incoming date, so Spark plans a single job
+        # and Iceberg writes a single snapshot
+        merge_sql = f"""
+        MERGE INTO {TABLE_NAME} target
+        USING laps_updates source
+        ON target.session_key = source.session_key 
+           AND target.driver_number = source.driver_number 
+           AND target.lap_number = source.lap_number
+           AND target.date_start = source.date_start
+           AND target.date_start BETWEEN DATE '{bounds['min_date']}' AND DATE '{bounds['max_date']}'
+        WHEN MATCHED THEN 
+            UPDATE SET 
+                lap_duration = source.lap_duration,
+                lap_time = source.lap_time,
+                i1_speed = source.i1_speed,
+                i2_speed = source.i2_speed,
+                st_speed = source.st_speed,
+                is_personal_best = source.is_personal_best,
+                compound = source.compound,
+                tyre_life = source.tyre_life,
+                fresh_tyre = source.fresh_tyre,
+                processing_timestamp = source.processing_timestamp
+        WHEN NOT MATCHED THEN 
+            INSERT (
+                session_key, driver_number, lap_number, lap_duration, lap_time,
+                i1_speed, i2_speed, st_speed, is_personal_best, compound,
+                tyre_life, fresh_tyre, processing_timestamp, date_start
+            ) VALUES (
+                source.session_key, source.driver_number, source.lap_number, 
+                source.lap_duration, source.lap_time, source.i1_speed, 
+                source.i2_speed, source.st_speed, source.is_personal_best, 
+                source.compound, source.tyre_life, source.fresh_tyre, 
+                source.processing_timestamp, source.date_start
+            )
+        """
+        
+        spark.sql(merge_sql)
+        
+        compact_laps_table_if_needed(bounds['min_date'], bounds['max_date'])
         
-        logger.info("All laps data processed and table optimized successfully")
+        logger.info("All laps data processed successfully")
         
     except Exception as e:
         logger.error(f"Error in batch processing: {str(e)}")
         raise
 
+def compact_laps_table_if_needed(min_date: date, max_date: date) -> None:
+    """Rewrite small data files in the just-merged date partitions once enough have accumulated."""
+    
+    small_files = spark.sql(f"""
+        SELECT COUNT(*) AS small_files
+        FROM {TABLE_NAME}.files
+        WHERE file_size_in_bytes < {SMALL_FILE_BYTES}
+          AND partition.date_start BETWEEN DATE '{min_date}' AND DATE '{max_date}'
+    """).first()['small_files']
+    
+    if small_files <= SMALL_FILE_THRESHOLD:
+        logger.info(f"Skipping compaction: {small_files} small files in laps dates "
+                   f"{min_date} to {max_date}")
+        return
+    
+    logger.info(f"Compacting {small_files} small laps files for dates {min_date} to {max_date}...")
+    spark.sql(f"""
+        CALL glue_catalog.system.rewrite_data_files(
+            table => '{DATABASE_NAME}.f1_laps',
+            where => 'date_start >= "{min_date}" AND date_start <= "{max_date}"',
+            options => map('target-file-size-bytes', '134217728')
+        )
+    """)
+
 def analyze_laps_statistics() -> None:
     """Analyze and log laps table statistics."""
     
     try:
+        # File and record counts come from the manifests, not the data files
+        file_stats = spark.sql(f"""
+            SELECT 
+                COUNT(*) as data_files,
+                SUM(record_count) as total_records,
+                SUM(file_size_in_bytes) as total_bytes
+            FROM {TABLE_NAME}.files
+            WHERE content = 0
+        """).first()
+        logger.info(f"Laps table: {file_stats['total_records']} records in "
+                   f"{file_stats['data_files']} files ({file_stats['total_bytes']} bytes)")
+        
+        if not EMIT_STATS:
+            return
+        
         logger.info("Analyzing laps table statistics...")
         
-        # Get statistics by date partition
-        stats_df = spark.sql(f"""
+        # Per-date statistics for the last 10 dates, with table totals computed
+        # over the same aggregate so everything comes back in one job
+        stats_pdf = spark.sql(f"""
+            WITH per_date AS (
+                SELECT 
+                    date_start,
+                    COUNT(*) as total_laps,
+                    approx_count_distinct(session_key, 0.02) as unique_sessions,
+                    approx_count_distinct(driver_number, 0.02) as unique_drivers,
+                    AVG(data_completeness_score) as avg_completeness_score,
+                    COUNT(CASE WHEN lap_time IS NOT NULL THEN 1 END) as laps_with_times
+                FROM {TABLE_NAME}
+                GROUP BY date_start
+            )
             SELECT 
-                date_start,
-                COUNT(*) as total_laps,
-                COUNT(DISTINCT session_key) as unique_sessions,
-                COUNT(DISTINCT driver_number) as unique_drivers,
-                AVG(data_completeness_score) as avg_completeness_score,
-                COUNT(CASE WHEN lap_time IS NOT NULL THEN 1 END) as laps_with_times
-            FROM {TABLE_NAME}
-            GROUP BY date_start
+                *,
+                SUM(total_laps) OVER () as table_total_laps,
+                MIN(date_start) OVER () as table_earliest_date,
+                MAX(date_start) OVER () as table_latest_date,
+                COUNT(*) OVER () as table_total_dates
+            FROM per_date
             ORDER BY date_start DESC
             LIMIT 10
-        """)
-        
-        logger.info("Recent Laps Statistics (Last 10 dates):")
-        for row in stats_df.collect():
-            logger.info(f"  {row['date_start']}: {row['total_laps']} laps, "
-                       f"{row['unique_sessions']} sessions, {row['unique_drivers']} drivers, "
-                       f"completeness: {row['avg_completeness_score']:.2f}")
-        
-        # Get overall table statistics
-        total_stats = spark.sql(f"""
-            SELECT 
-                COUNT(*) as total_laps,
-                MIN(date_start) as earliest_date,
-                MAX(date_start) as latest_date,
-                COUNT(DISTINCT date_start) as total_dates
-            FROM {TABLE_NAME}
-        """).collect()[0]
+        """).toPandas()
         
-        logger.info(f"Total table statistics: {total_stats['total_laps']} laps, "
-                   f"from {total_stats['earliest_date']} to {total_stats['latest_date']}, "
-                   f"across {total_stats['total_dates']} dates")
+        logger.info(f"Laps statistics (last 10 dates): "
+                   f"{stats_pdf.to_json(orient='records', date_format='iso')}")
         
     except Exception as e:
         logger.error(f"Error analyzing table statistics: {str(e)}")
@@ -317,8 +381,9 @@ def main():
         # Validate and clean data
         clean_laps_df = validate_and_clean_laps_data(laps_df)
         
-        # Process data in batches by date partition
+        # Merge all date partitions in one pass
         process_laps_in_batches(clean_laps_df)
+        clean_laps_df.unpersist()
         
         # Analyze table statistics
         analyze_laps_statistics()
@@ -8,12 +8,12 @@ Key Functions:
 - Reads processed meetings data from S3
 - Creates/updates Iceberg table with ACID transactions
 - Handles schema evolution and data quality checks
-- Optimizes table layout for query performance
+- Compacts small files once they accumulate
 """
 
 import sys
-from pyspark.context import SparkContext
-from pyspark.sql import SparkSession, DataFrame
+from pyspark import StorageLevel
+from pyspark.sql import DataFrame
 from pyspark.sql.functions import *
 from pyspark.sql.types import *
 from awsglue.context import GlueContext
@@ -21,6 +21,8 @@ from awsglue.job import Job
 from awsglue.utils import getResolvedOptions
 import logging
 
+from _spark_bootstrap import build_spark
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,19 +36,8 @@ args = getResolvedOptions(sys.argv, [
 ])
 
 # Initialize Spark with Iceberg support
-sc = SparkContext()
-glue_context = GlueContext(sc)
-
-# Configure Spark for Iceberg
-spark = SparkSession.builder \
-    .config("spark.sql.extensions", "org.apache.iceberg.spark.extensions.IcebergSparkSessionExtensions") \
-    .config("spark.sql.catalog.glue_catalog", "org.apache.iceberg.spark.SparkCatalog") \
-    .config("spark.sql.catalog.glue_catalog.warehouse", f"s3://{args['DATA_LAKE_BUCKET']}/iceberg-tables/") \
-    .config("spark.sql.catalog.glue_catalog.catalog-impl", "org.apache.iceberg.aws.glue.GlueCatalog") \
-    .config("spark.sql.catalog.glue_catalog.io-impl", "org.apache.iceberg.aws.s3.S3FileIO") \
-    .config("spark.sql.adaptive.enabled", "true") \
-    .config("spark.serializer", "org.apache.spark.serializer.KryoSerializer") \
-    .getOrCreate()
+spark = build_spark(args)
+glue_context = GlueContext(spark.sparkContext)
 
 job = Job(glue_context)
 job.init(args['JOB_NAME'], args)
@@ -55,7 +46,15 @@ job.init(args['JOB_NAME'], args)
 DATABASE_NAME = args['DATABASE_NAME']
 DATA_LAKE_BUCKET = args['DATA_LAKE_BUCKET']
 ENVIRONMENT = args['ENVIRONMENT']
+# Full-table statistics scans run in dev, elsewhere only with --EMIT_STATS true
+EMIT_STATS = ENVIRONMENT == 'dev' or (
+    '--EMIT_STATS' in sys.argv
+    and getResolvedOptions(sys.argv, ['EMIT_STATS'])['EMIT_STATS'].lower() == 'true'
+)
 TABLE_NAME = f"glue_catalog.{DATABASE_NAME}.f1_meetings"
+# Compaction runs only once this many data files fall below the small-file size
+SMALL_FILE_BYTES = 33554432
+SMALL_FILE_THRESHOLD = 100
 
 def read_processed_meetings_data() -> DataFrame:
     """Read processed F1 meetings data from S3."""
@@ -67,11 +66,11 @@ def read_processed_meetings_data() -> DataFrame:
         
         df = spark.read.parquet(input_path)
         
-        if df.count() == 0:
+        if not df.head(1):
             logger.warning("No meetings data found")
             return None
             
-        logger.info(f"Successfully read {df.count()} meeting records")
+        logger.info("Successfully read meetings data")
         return df
         
     except Exception as e:
@@ -82,43 +81,47 @@ def create_meetings_iceberg_table() -> None:
     """Create the F1 meetings Iceberg table if it doesn't exist."""
     
     try:
-        # Check if table exists
-        existing_tables = spark.sql(f"SHOW TABLES IN glue_catalog.{DATABASE_NAME}").collect()
-        table_exists = any(row['tableName'] == 'f1_meetings' for row in existing_tables)
+        logger.info("Ensuring F1 meetings Iceberg table exists...")
+        
+        create_table_sql = f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+            meeting_key bigint,
+            meeting_name string,
+            meeting_official_name string,
+            location string,
+            country_key bigint,
+            country_code string,
+            country_name string,
+            circuit_key bigint,
+            circuit_short_name string,
+            date_start timestamp,
+            year int,
+            gmt_offset string,
+            processing_timestamp timestamp
+        ) USING ICEBERG
+        PARTITIONED BY (year)
+        TBLPROPERTIES (
+            'format-version'='2',
+            'write.parquet.compression-codec'='zstd',
+            'write.parquet.compression-level'='3',
+            'write.metadata.delete-after-commit.enabled'='true',
+            'write.metadata.previous-versions-max'='5',
+            'write.object-storage.enabled'='true'
+        )
+        """
+        
+        spark.sql(create_table_sql)
+        # Keeps tables created before these write properties were added in line:
+        # ZSTD level 3 data files and hashed object-store paths
+        spark.sql(f"""
+        ALTER TABLE {TABLE_NAME} SET TBLPROPERTIES (
+            'write.parquet.compression-codec'='zstd',
+            'write.parquet.compression-level'='3',
+            'write.object-storage.enabled'='true'
+        )
+        """)
+        logger.info("F1 meetings Iceberg table is ready")
         
-        if not table_exists:
-            logger.info("Creating F1 meetings Iceberg table...")
-            
-            create_table_sql = f"""
-            CREATE TABLE {TABLE_NAME} (
-                meeting_key bigint,
-                meeting_name string,
-                meeting_official_name string,
-                location string,
-                country_key bigint,
-                country_code string,
-                country_name string,
-                circuit_key bigint,
-                circuit_short_name string,
-                date_start timestamp,
-                year int,
-                gmt_offset string,
-                processing_timestamp timestamp
-            ) USING ICEBERG
-            PARTITIONED BY (year)
-            TBLPROPERTIES (
-                'format-version'='2',
-                'write.parquet.compression-codec'='snappy',
-                'write.metadata.delete-after-commit.enabled'='true',
-                'write.metadata.previous-versions-max'='5'
-            )
-            """
-            
-            spark.sql(create_table_sql)
-            logger.info("F1 meetings Iceberg table created successfully")
-        else:
-            logger.info("F1 meetings Iceberg table already exists")
-            
     except Exception as e:
         logger.error(f"Error creating meetings Iceberg table: {str(e)}")
         raise
@@ -129,6 +132,8 @@ def validate_meetings_data(df: DataFrame) -> DataFrame:
     logger.info("Validating meetings data...")
     
     # Data quality checks
+    # Cache the input so the counts below don't rescan S3
+    df = df.persist(StorageLevel.MEMORY_AND_DISK)
     initial_count = df.count()
     
     # Remove duplicates based on meeting_key and year
@@ -149,7 +154,9 @@ def validate_meetings_data(df: DataFrame) -> DataFrame:
         .otherwise(0.6)
     )
     
+    df_clean = df_clean.persist(StorageLevel.MEMORY_AND_DISK)
     final_count = df_clean.count()
+    df.unpersist()
     logger.info(f"Data validation: {initial_count} -> {final_count} records (removed {initial_count - final_count} invalid records)")
     
     return df_clean
@@ -158,7 +165,8 @@ def upsert_meetings_data(df: DataFrame) -> None:
     """Upsert F1 meetings data into Iceberg table using merge operation."""
     
     try:
-        logger.info(f"Upserting {df.count()} meeting records into Iceberg table...")
+        # Record count was already logged by validate_meetings_data
+        logger.info("Upserting meeting records into Iceberg table...")
         
         # Create a temporary view for the merge operation
         df.createOrReplaceTempView("meetings_updates")
@@ -195,42 +203,64 @@ def upsert_meetings_data(df: DataFrame) -> None:
         
         spark.sql(merge_sql)
         
-        # Optimize table layout for better query performance
-        optimize_sql = f"OPTIMIZE {TABLE_NAME}"
-        spark.sql(optimize_sql)
+        compact_meetings_table_if_needed()
         
-        logger.info("Meetings data upserted and table optimized successfully")
+        logger.info("Meetings data upserted successfully")
         
     except Exception as e:
         logger.error(f"Error upserting meetings data: {str(e)}")
         raise
 
+def compact_meetings_table_if_needed() -> None:
+    """Rewrite small data files once enough of them have accumulated."""
+    
+    small_files = spark.sql(f"""
+        SELECT COUNT(*) AS small_files
+        FROM {TABLE_NAME}.files
+        WHERE file_size_in_bytes < {SMALL_FILE_BYTES}
+    """).first()['small_files']
+    
+    if small_files <= SMALL_FILE_THRESHOLD:
+        logger.info(f"Skipping compaction: {small_files} small files in meetings table")
+        return
+    
+    logger.info(f"Compacting {small_files} small meetings files...")
+    spark.sql(f"CALL glue_catalog.system.rewrite_data_files(table => '{DATABASE_NAME}.f1_meetings')")
+
 def analyze_table_statistics() -> None:
     """Analyze and log table statistics for monitoring."""
     
     try:
+        # File and record counts come from the manifests, not the data files
+        file_stats = spark.sql(f"""
+            SELECT 
+                COUNT(*) as data_files,
+                SUM(record_count) as total_records,
+                SUM(file_size_in_bytes) as total_bytes
+            FROM {TABLE_NAME}.files
+            WHERE content = 0
+        """).first()
+        logger.info(f"Meetings table: {file_stats['total_records']} records in "
+                   f"{file_stats['data_files']} files ({file_stats['total_bytes']} bytes)")
+        
+        if not EMIT_STATS:
+            return
+        
         logger.info("Analyzing table statistics...")
         
         # Get row count by year
-        stats_df = spark.sql(f"""
+        stats_pdf = spark.sql(f"""
             SELECT 
                 year,
                 COUNT(*) as meeting_count,
-                COUNT(DISTINCT country_name) as unique_countries,
-                COUNT(DISTINCT circuit_short_name) as unique_circuits
+                approx_count_distinct(country_name, 0.02) as unique_countries,
+                approx_count_distinct(circuit_short_name, 0.02) as unique_circuits
             FROM {TABLE_NAME}
             GROUP BY year
             ORDER BY year DESC
-        """)
-        
-        logger.info("Table Statistics:")
-        for row in stats_df.collect():
-            logger.info(f"  Year {row['year']}: {row['meeting_count']} meetings, "
-                       f"{row['unique_countries']} countries, {row['unique_circuits']} circuits")
+        """).toPandas()
         
-        # Get total table size and file count
-        table_info = spark.sql(f"DESCRIBE EXTENDED {TABLE_NAME}").collect()
-        logger.info("Table metadata updated successfully")
+        logger.info(f"Table statistics: {stats_pdf.to_json(orient='records')}")
         
     except Exception as e:
         logger.error(f"Error analyzing table statistics: {str(e)}")
@@ -255,6 +285,7 @@ def main():
         
         # Upsert data into Iceberg table
         upsert_meetings_data(clean_meetings_df)
+        clean_meetings_df.unpersist()
         
         # Analyze table statistics
         analyze_table_statistics()
@@ -5,13 +5,15 @@ This job processes raw F1 data from the OpenF1 API into structured format
 ready for further transformation into Iceberg tables.
 
 Key Functions:
-- Reads raw JSON data from S3
+- Reads raw Parquet data from S3 (JSON for legacy backfills)
 - Validates and cleans data
 - Partitions by year and endpoint
 - Outputs to processed-data bucket location
 """
 
 import sys
+from typing import Dict, List
+from pyspark import SparkConf
 from pyspark.context import SparkContext
 from pyspark.sql import SparkSession, DataFrame
 from pyspark.sql.functions import *
@@ -34,9 +36,33 @@ args = getResolvedOptions(sys.argv, [
 ])
 
 # Initialize Spark and Glue contexts
-sc = SparkContext()
+# Serializer, compression and codegen settings are read when the SparkContext
+# starts, so they go into the SparkConf it is created from; getOrCreate reuses
+# a context that is already running (and its compiled-code cache) instead of
+# failing on a second initialisation
+SPARK_CONFIG = {
+    "spark.sql.adaptive.enabled": "true",
+    "spark.sql.adaptive.coalescePartitions.enabled": "true",
+    "spark.sql.adaptive.advisoryPartitionSizeInBytes": "134217728",
+    "spark.sql.adaptive.coalescePartitions.minPartitionSize": "67108864",
+    "spark.sql.files.maxPartitionBytes": "134217728",
+    "spark.sql.shuffle.partitions": "200",
+    "spark.sql.autoBroadcastJoinThreshold": "52428800",
+    "spark.sql.adaptive.autoBroadcastJoinThreshold": "52428800",
+    "spark.sql.sources.partitionOverwriteMode": "dynamic",
+    "spark.sql.parquet.enableVectorizedReader": "true",
+    "spark.sql.parquet.filterPushdown": "true",
+    "spark.sql.parquet.mergeSchema": "false",
+    "spark.sql.parquet.compression.codec": "zstd",
+    "spark.hadoop.parquet.compression.codec.zstd.level": "3",
+    "spark.serializer": "org.apache.spark.serializer.KryoSerializer",
+    "spark.rdd.compress": "true",
+    "spark.sql.codegen.cache.maxEntries": "1000",
+}
+spark_conf = SparkConf().setAll(list(SPARK_CONFIG.items()))
+sc = SparkContext.getOrCreate(spark_conf)
 glue_context = GlueContext(sc)
-spark = SparkSession.builder.config("spark.sql.adaptive.enabled", "true").getOrCreate()
+spark = SparkSession.builder.config(conf=spark_conf).getOrCreate()
 job = Job(glue_context)
 job.init(args['JOB_NAME'], args)
 
@@ -44,32 +70,126 @@ job.init(args['JOB_NAME'], args)
 DATABASE_NAME = args['DATABASE_NAME']
 DATA_LAKE_BUCKET = args['DATA_LAKE_BUCKET']
 ENVIRONMENT = args['ENVIRONMENT']
+# Raw files are Parquet as written by DataExtractor; pass --RAW_DATA_FORMAT json
+# to reprocess older JSON drops
+RAW_DATA_FORMAT = (
+    getResolvedOptions(sys.argv, ['RAW_DATA_FORMAT'])['RAW_DATA_FORMAT'].lower()
+    if '--RAW_DATA_FORMAT' in sys.argv else 'parquet'
+)
 
-def read_raw_data(endpoint: str, year: int) -> DataFrame:
-    """Read raw F1 data from S3 for a specific endpoint and year."""
+# Raw OpenF1 schemas, limited to the fields the process_* functions use.
+# Supplying them skips schema inference. For Parquet, a field is read as null
+# only in the files whose payload didn't include it; the extractor's RAW_DTYPES
+# writes the same types, so every file agrees with these schemas.
+MEETINGS_SCHEMA = StructType([
+    StructField("meeting_key", LongType(), True),
+    StructField("meeting_name", StringType(), True),
+    StructField("meeting_official_name", StringType(), True),
+    StructField("location", StringType(), True),
+    StructField("country_key", LongType(), True),
+    StructField("country_code", StringType(), True),
+    StructField("country_name", StringType(), True),
+    StructField("circuit_key", LongType(), True),
+    StructField("circuit_short_name", StringType(), True),
+    StructField("date_start", StringType(), True),
+    StructField("year", LongType(), True),
+    StructField("gmt_offset", StringType(), True)
+])
+
+SESSIONS_SCHEMA = StructType([
+    StructField("session_key", LongType(), True),
+    StructField("session_name", StringType(), True),
+    StructField("session_type", StringType(), True),
+    StructField("date_start", StringType(), True),
+    StructField("date_end", StringType(), True),
+    StructField("gmt_offset", StringType(), True),
+    StructField("meeting_key", LongType(), True)
+])
+
+DRIVERS_SCHEMA = StructType([
+    StructField("driver_number", LongType(), True),
+    StructField("broadcast_name", StringType(), True),
+    StructField("full_name", StringType(), True),
+    StructField("name_acronym", StringType(), True),
+    StructField("team_name", StringType(), True),
+    StructField("team_colour", StringType(), True),
+    StructField("first_name", StringType(), True),
+    StructField("last_name", StringType(), True),
+    StructField("headshot_url", StringType(), True),
+    StructField("country_code", StringType(), True),
+    StructField("session_key", LongType(), True)
+])
+
+LAPS_SCHEMA = StructType([
+    StructField("date_start", StringType(), True),
+    StructField("session_key", LongType(), True),
+    StructField("driver_number", LongType(), True),
+    StructField("lap_number", LongType(), True),
+    StructField("lap_duration", DoubleType(), True),
+    StructField("lap_time", DoubleType(), True),
+    StructField("i1_speed", DoubleType(), True),
+    StructField("i2_speed", DoubleType(), True),
+    StructField("st_speed", DoubleType(), True),
+    StructField("is_personal_best", BooleanType(), True),
+    StructField("compound", StringType(), True),
+    StructField("tyre_life", LongType(), True),
+    StructField("fresh_tyre", BooleanType(), True)
+])
+
+POSITION_SCHEMA = StructType([
+    StructField("date", StringType(), True),
+    StructField("session_key", LongType(), True),
+    StructField("driver_number", LongType(), True),
+    StructField("position", LongType(), True)
+])
+
+RAW_SCHEMAS = {
+    'meetings': MEETINGS_SCHEMA,
+    'sessions': SESSIONS_SCHEMA,
+    'drivers': DRIVERS_SCHEMA,
+    'laps': LAPS_SCHEMA,
+    'position': POSITION_SCHEMA
+}
+
+def read_raw_data(endpoint: str, years: List[int]) -> DataFrame:
+    """Read raw F1 data from S3 for an endpoint across all requested years as one DataFrame."""
     
-    input_path = f"s3://{DATA_LAKE_BUCKET}/raw-data/year={year}/endpoint={endpoint}/"
+    schema = RAW_SCHEMAS[endpoint]
+    # One brace-expanded path lists every year in a single scan instead of one read per year
+    year_glob = ",".join(str(year) for year in years)
+    input_path = f"s3://{DATA_LAKE_BUCKET}/raw-data/year={{{year_glob}}}/endpoint={endpoint}/"
     
     try:
         logger.info(f"Reading raw data from: {input_path}")
         
-        # Read JSON files with error handling
-        df = spark.read.option("multiLine", "true").json(input_path)
+        # Read with the known endpoint schema instead of inferring it from one
+        # file; only the schema's columns are read
+        if RAW_DATA_FORMAT == 'json':
+            df = spark.read.schema(schema).option("multiLine", "true").json(input_path)
+        else:
+            df = spark.read.schema(schema).parquet(input_path)
+        
+        # The extraction year comes from the year= directory; it is taken from the
+        # file path rather than partition discovery because meetings carry their
+        # own year column
+        df = df.withColumn(
+            "extraction_year",
+            regexp_extract(input_file_name(), r"/year=(\d{4})/", 1).cast("int")
+        )
         
-        if df.count() == 0:
-            logger.warning(f"No data found at {input_path}")
+        if not df.head(1):
+            logger.warning(f"No {endpoint} data found for years {years}")
             return None
             
         # Add metadata columns
-        df = df.withColumn("extraction_year", lit(year)) \
-              .withColumn("endpoint", lit(endpoint)) \
+        df = df.withColumn("endpoint", lit(endpoint)) \
               .withColumn("processing_timestamp", current_timestamp())
         
-        logger.info(f"Successfully read {df.count()} records from {endpoint} for {year}")
+        logger.info(f"Successfully read raw data from {endpoint} for years {years}")
         return df
         
     except Exception as e:
-        logger.error(f"Error reading data from {input_path}: {str(e)}")
+        logger.warning(f"No data found at {input_path}: {str(e)}")
         return None
 
 def process_meetings_data(df: DataFrame) -> DataFrame:
@@ -109,7 +229,8 @@ def process_sessions_data(df: DataFrame) -> DataFrame:
         to_timestamp(col("date_end")).alias("date_end"),
         col("gmt_offset").cast("string"),
         col("meeting_key").cast("bigint"),
-        current_timestamp().alias("processing_timestamp")
+        current_timestamp().alias("processing_timestamp"),
+        col("extraction_year").cast("int").alias("year")
     ).filter(col("session_key").isNotNull())
     
     return processed_df
@@ -131,7 +252,8 @@ def process_drivers_data(df: DataFrame) -> DataFrame:
         col("headshot_url").cast("string"),
         col("country_code").cast("string"),
         col("session_key").cast("bigint"),
-        current_timestamp().alias("processing_timestamp")
+        current_timestamp().alias("processing_timestamp"),
+        col("extraction_year").cast("int").alias("year")
     ).filter(col("driver_number").isNotNull())
     
     return processed_df
@@ -155,7 +277,8 @@ def process_laps_data(df: DataFrame) -> DataFrame:
         col("compound").cast("string"),
         col("tyre_life").cast("int"),
         col("fresh_tyre").cast("boolean"),
-        current_timestamp().alias("processing_timestamp")
+        current_timestamp().alias("processing_timestamp"),
+        col("extraction_year").cast("int").alias("year")
     ).filter(
         col("session_key").isNotNull() & 
         col("driver_number").isNotNull() &
@@ -174,7 +297,8 @@ def process_positions_data(df: DataFrame) -> DataFrame:
         col("session_key").cast("bigint"),
         col("driver_number").cast("int"),
         col("position").cast("int"),
-        current_timestamp().alias("processing_timestamp")
+        current_timestamp().alias("processing_timestamp"),
+        col("extraction_year").cast("int").alias("year")
     ).filter(
         col("session_key").isNotNull() & 
         col("driver_number").isNotNull()
@@ -182,22 +306,44 @@ def process_positions_data(df: DataFrame) -> DataFrame:
     
     return processed_df
 
-def write_processed_data(df: DataFrame, endpoint: str, year: int) -> None:
-    """Write processed data to S3 in Parquet format with partitioning."""
+def write_processed_data(df: DataFrame, endpoint: str) -> Dict[int, int]:
+    """Write processed data to S3 in Parquet format partitioned by year and return record counts per year."""
     
-    output_path = f"s3://{DATA_LAKE_BUCKET}/processed-data/{endpoint}/year={year}/"
+    output_path = f"s3://{DATA_LAKE_BUCKET}/processed-data/{endpoint}/"
     
     try:
-        logger.info(f"Writing {df.count()} records to: {output_path}")
+        logger.info(f"Writing processed data to: {output_path}")
+        
+        # Cluster rows by session and driver inside each file so Parquet
+        # min/max statistics let session_key/driver_number filters skip row groups
+        cluster_columns = [c for c in ("session_key", "driver_number") if c in df.columns]
+        df = df.sortWithinPartitions("year", *cluster_columns)
+        
+        # Write parallelism follows the input splits (~128 MB each) rather than
+        # a fixed task count; dynamic partition overwrite replaces only the
+        # year= directories present in this run
+        # Bloom filters on the lookup keys let point filters skip row groups
+        # whose min/max range still spans the requested value
+        writer_options = {"compression": "zstd", "parquet.enable.dictionary": "true"}
+        for key_column in cluster_columns:
+            writer_options[f"parquet.bloom.filter.enabled#{key_column}"] = "true"
+        if "session_key" in cluster_columns:
+            writer_options["parquet.bloom.filter.expected.ndv#session_key"] = "500"
         
-        # Configure write options for performance
-        df.coalesce(4) \
-          .write \
+        df.write \
           .mode("overwrite") \
-          .option("compression", "snappy") \
+          .partitionBy("year") \
+          .options(**writer_options) \
           .parquet(output_path)
         
-        logger.info(f"Successfully wrote processed data for {endpoint} {year}")
+        # Only partition values are needed, so this doesn't re-run the raw
+        # read and transform
+        records_by_year = {
+            row['year']: row['count']
+            for row in spark.read.parquet(output_path).groupBy("year").count().collect()
+        }
+        logger.info(f"Successfully wrote processed data for {endpoint}: {records_by_year}")
+        return records_by_year
         
     except Exception as e:
         logger.error(f"Error writing processed data to {output_path}: {str(e)}")
@@ -222,38 +368,39 @@ def main():
     processing_summary = []
     
     for endpoint, processor_func in endpoints_processors.items():
-        for year in years:
-            try:
-                logger.info(f"Processing {endpoint} data for year {year}")
-                
-                # Read raw data
-                raw_df = read_raw_data(endpoint, year)
-                if raw_df is None:
-                    logger.warning(f"Skipping {endpoint} {year} - no data found")
-                    continue
-                
-                # Process data using endpoint-specific processor
-                processed_df = processor_func(raw_df)
-                
-                # Write processed data
-                write_processed_data(processed_df, endpoint, year)
-                
-                processing_summary.append({
-                    'endpoint': endpoint,
-                    'year': year,
-                    'records_processed': processed_df.count(),
-                    'status': 'SUCCESS'
-                })
-                
-            except Exception as e:
-                logger.error(f"Error processing {endpoint} {year}: {str(e)}")
-                processing_summary.append({
-                    'endpoint': endpoint,
-                    'year': year,
-                    'records_processed': 0,
-                    'status': f'ERROR: {str(e)}'
-                })
+        try:
+            logger.info(f"Processing {endpoint} data for years {years}")
+            
+            # Read raw data for all years at once
+            raw_df = read_raw_data(endpoint, years)
+            if raw_df is None:
+                logger.warning(f"Skipping {endpoint} - no data found")
                 continue
+            
+            # Process data using endpoint-specific processor
+            processed_df = processor_func(raw_df)
+            
+            # Write processed data, one year= partition per year
+            records_by_year = write_processed_data(processed_df, endpoint)
+            
+            for year in years:
+                if year in records_by_year:
+                    processing_summary.append({
+                        'endpoint': endpoint,
+                        'year': year,
+                        'records_processed': records_by_year[year],
+                        'status': 'SUCCESS'
+                    })
+            
+        except Exception as e:
+            logger.error(f"Error processing {endpoint}: {str(e)}")
+            processing_summary.append({
+                'endpoint': endpoint,
+                'year': 'all',
+                'records_processed': 0,
+                'status': f'ERROR: {str(e)}'
+            })
+            continue
     
     # Log processing summary
     logger.info("Processing Summary:")
@@ -264,4 +411,4 @@ def main():
 
 if __name__ == "__main__":
     main()
-    job.commit()
\ No newline at end of file
+    job.commit()
@@ -5,8 +5,41 @@ Improved F1 Pipeline with practical data extraction limits.
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Concurrent per-session API requests
+SESSION_WORKERS = 8
+
+def fetch_session_data(client, session):
+    """Fetch drivers and, for race sessions, laps for one session.
+    
+    Returns a (drivers_df, laps_df, error) tuple; frames are None when there
+    was no data, and error holds the exception that stopped the session early.
+    """
+    session_key = session['session_key']
+    session_name = session.get('session_name', 'Unknown')
+    drivers_df = laps_df = None
+    
+    # Extract key data types for this session
+    try:
+        data = client.get_drivers(session_key=session_key)
+        if len(data) > 0:
+            drivers_df = data
+        
+        # Try laps (if it's a race session)
+        if 'race' in session_name.lower():
+            data = client.get_laps(session_key=session_key)
+            if len(data) > 0:
+                laps_df = data
+    
+    except Exception as e:
+        return drivers_df, laps_df, e
+    
+    return drivers_df, laps_df, None
+
 def run_practical_extraction():
     """Run F1 data extraction with practical limits."""
     print("🏎️ F1 Data Platform - Practical Data Extraction")
@@ -50,31 +83,38 @@ def run_practical_extraction():
         recent_sessions = sessions_df.tail(5)  # Last 5 sessions
         
         total_records = 0
-        for idx, session in recent_sessions.iterrows():
+        drivers_frames = []
+        laps_frames = []
+        
+        # Fetch sessions concurrently; database writes stay on this thread
+        # Plain dicts of Python scalars; iterrows would box a Series per row
+        sessions = recent_sessions.to_dict("records")
+        with ThreadPoolExecutor(max_workers=SESSION_WORKERS) as executor:
+            results = list(executor.map(
+                lambda session: fetch_session_data(extractor.openf1_client, session), sessions))
+        
+        for session, (drivers_df, laps_df, error) in zip(sessions, results):
             session_key = session['session_key']
             session_name = session.get('session_name', 'Unknown')
             
             print(f"   Processing: {session_name} (key: {session_key})")
             
-            # Extract key data types for this session
-            try:
-                drivers_df = extractor.openf1_client.get_drivers(session_key=session_key)
-                if len(drivers_df) > 0:
-                    extractor._save_to_database(drivers_df, "raw_drivers")
-                    total_records += len(drivers_df)
-                    print(f"     Drivers: {len(drivers_df)} records")
-                
-                # Try laps (if it's a race session)
-                if 'race' in session_name.lower():
-                    laps_df = extractor.openf1_client.get_laps(session_key=session_key)
-                    if len(laps_df) > 0:
-                        extractor._save_to_database(laps_df, "raw_laps") 
-                        total_records += len(laps_df)
-                        print(f"     Laps: {len(laps_df)} records")
-                
-            except Exception as e:
-                print(f"     ⚠️ Error: {str(e)[:50]}...")
-                continue
+            if drivers_df is not None:
+                drivers_frames.append(drivers_df)
+                total_records += len(drivers_df)
+                print(f"     Drivers: {len(drivers_df)} records")
+            if laps_df is not None:
+                laps_frames.append(laps_df)
+                total_records += len(laps_df)
+                print(f"     Laps: {len(laps_df)} records")
+            if error is not None:
+                print(f"     ⚠️ Error: {str(error)[:50]}...")
+        
+        # One bulk insert per table instead of one per session
+        if drivers_frames:
+            extractor._save_to_database(pd.concat(drivers_frames, ignore_index=True, copy=False), "raw_drivers")
+        if laps_frames:
+            extractor._save_to_database(pd.concat(laps_frames, ignore_index=True, copy=False), "raw_laps")
         
         print(f"\n✅ Extraction completed!")
         print(f"   Total detailed records: {total_records}")
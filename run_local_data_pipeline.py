@@ -6,10 +6,86 @@ Saves extracted data to local-data folder for easy access and analysis.
 
 import sys
 import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def run_local_data_pipeline():
-    """Run F1 pipeline with output to local-data folder."""
+# Concurrent per-session API requests
+SESSION_WORKERS = 8
+
+def save_dataset(data, base_path, emit_csv=False):
+    """Write a DataFrame or Arrow table as Parquet (plus CSV if requested) from a single Arrow table."""
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    
+    table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(data, preserve_index=False)
+    paths = [f"{base_path}.parquet"]
+    pq.write_table(table, paths[0], compression="snappy")
+    
+    if emit_csv:
+        paths.append(f"{base_path}.csv")
+        # Arrow's CSV writer can't flatten list/struct columns (e.g. lap segments)
+        if any(pa.types.is_nested(field.type) for field in table.schema):
+            table.to_pandas().to_csv(paths[1], index=False)
+        else:
+            pa_csv.write_csv(table, paths[1])
+    
+    return paths
+
+def extract_session_data(client, session):
+    """Fetch drivers, laps (race/qualifying only) and a position sample for one session.
+    
+    Returns a (drivers_df, laps_df, position_sample, error) tuple; frames are
+    None when there was no data, and error holds the exception that stopped
+    the session early, if any.
+    """
+    session_key = session['session_key']
+    session_name = session.get('session_name', 'Unknown')
+    meeting_name = session.get('meeting_key', 'Unknown')
+    drivers_df = laps_df = position_sample = None
+    
+    try:
+        # Get drivers
+        data = client.get_drivers(session_key=session_key)
+        if len(data) > 0:
+            drivers_df = data
+            drivers_df['session_name'] = session_name
+            drivers_df['meeting_key'] = meeting_name
+        
+        # Get laps (for race sessions)
+        if 'race' in session_name.lower() or 'qualifying' in session_name.lower():
+            data = client.get_laps(session_key=session_key)
+            if len(data) > 0:
+                laps_df = data
+                laps_df['session_name'] = session_name
+                laps_df['meeting_key'] = meeting_name
+        
+        # Get positions (sample of position data)
+        records = client.get_data("position", {"session_key": session_key}, as_dataframe=False)
+        if len(records) > 0:
+            # Take a sample to avoid huge files; sampling the raw records means
+            # only the kept rows are ever built into a DataFrame
+            position_sample = pd.DataFrame(random.sample(records, min(100, len(records))))
+            position_sample['_extracted_at'] = datetime.utcnow()
+            position_sample['_endpoint'] = "position"
+            position_sample['session_name'] = session_name
+            position_sample['meeting_key'] = meeting_name
+    
+    except Exception as e:
+        return drivers_df, laps_df, position_sample, e
+    
+    return drivers_df, laps_df, position_sample, None
+
+def run_local_data_pipeline(emit_csv=False):
+    """Run F1 pipeline with output to local-data folder.
+    
+    Datasets are written as Parquet; pass emit_csv=True (--emit-csv) to also
+    write CSV copies.
+    """
     print("🏎️ F1 Data Platform - Local Data Output")
     print("=" * 50)
     
@@ -17,8 +93,7 @@ def run_local_data_pipeline():
         from f1_data_platform.config.settings import Settings, StorageConfig, DatabaseConfig
         from f1_data_platform.cloud_swap import CloudProviderFactory
         from f1_data_platform.extractors import DataExtractor
-        import pandas as pd
-        from datetime import datetime
+        import pyarrow as pa
         
         # Ensure local-data directory exists
         os.makedirs("./local-data", exist_ok=True)
@@ -51,14 +126,8 @@ def run_local_data_pipeline():
         print(f"   Found: {len(meetings_df)} meetings")
         
         if len(meetings_df) > 0:
-            meetings_file = f"./local-data/meetings/f1_meetings_2023_{timestamp}.csv"
-            meetings_df.to_csv(meetings_file, index=False)
-            print(f"   ✅ Saved to: {meetings_file}")
-            
-            # Also save as parquet for efficiency
-            meetings_parquet = f"./local-data/meetings/f1_meetings_2023_{timestamp}.parquet"
-            meetings_df.to_parquet(meetings_parquet, index=False)
-            print(f"   ✅ Saved to: {meetings_parquet}")
+            for meetings_file in save_dataset(meetings_df, f"./local-data/meetings/f1_meetings_2023_{timestamp}", emit_csv):
+                print(f"   ✅ Saved to: {meetings_file}")
         
         # Step 2: Extract and save sessions
         print(f"\n📥 Step 2: Extracting 2023 F1 sessions...")
@@ -66,84 +135,69 @@ def run_local_data_pipeline():
         print(f"   Found: {len(sessions_df)} sessions")
         
         if len(sessions_df) > 0:
-            sessions_file = f"./local-data/sessions/f1_sessions_2023_{timestamp}.csv"
-            sessions_df.to_csv(sessions_file, index=False)
-            print(f"   ✅ Saved to: {sessions_file}")
-            
-            sessions_parquet = f"./local-data/sessions/f1_sessions_2023_{timestamp}.parquet"
-            sessions_df.to_parquet(sessions_parquet, index=False)
-            print(f"   ✅ Saved to: {sessions_parquet}")
+            for sessions_file in save_dataset(sessions_df, f"./local-data/sessions/f1_sessions_2023_{timestamp}", emit_csv):
+                print(f"   ✅ Saved to: {sessions_file}")
         
         # Step 3: Extract detailed data for recent sessions
         print(f"\n📥 Step 3: Extracting detailed data for recent sessions...")
         recent_sessions = sessions_df.tail(3)  # Last 3 sessions for faster processing
         
         all_drivers = []
-        all_laps = []
         all_positions = []
+        # Laps are the largest dataset: each session's laps are written to
+        # their own part file as they arrive instead of being held until the end
+        laps_dir = f"./local-data/laps/f1_laps_recent_{timestamp}"
+        laps_files = []
+        laps_records = 0
         
-        for idx, session in recent_sessions.iterrows():
-            session_key = session['session_key']
-            session_name = session.get('session_name', 'Unknown')
-            meeting_name = session.get('meeting_key', 'Unknown')
+        # Fetch sessions concurrently; the calls are API round-trip bound
+        # Plain dicts of Python scalars; iterrows would box a Series per row
+        sessions = recent_sessions.to_dict("records")
+        # Results are consumed as they arrive, so a session's laps frame is
+        # released once its part file is written
+        with ThreadPoolExecutor(max_workers=SESSION_WORKERS) as executor:
+            results = executor.map(lambda session: extract_session_data(extractor.openf1_client, session), sessions)
+            
+            for session, (drivers_df, laps_df, position_sample, error) in zip(sessions, results):
+                session_key = session['session_key']
+                session_name = session.get('session_name', 'Unknown')
             
-            print(f"   Processing: {session_name} (session_key: {session_key})")
+                print(f"   Processing: {session_name} (session_key: {session_key})")
             
-            try:
-                # Get drivers
-                drivers_df = extractor.openf1_client.get_drivers(session_key=session_key)
-                if len(drivers_df) > 0:
-                    drivers_df['session_name'] = session_name
-                    drivers_df['meeting_key'] = meeting_name
-                    all_drivers.append(drivers_df)
+                # Drivers and positions are kept as Arrow tables so combining them
+                # below appends column chunks instead of rebuilding pandas blocks
+                if drivers_df is not None:
+                    all_drivers.append(pa.Table.from_pandas(drivers_df, preserve_index=False))
                     print(f"     Drivers: {len(drivers_df)} records")
-                
-                # Get laps (for race sessions)
-                if 'race' in session_name.lower() or 'qualifying' in session_name.lower():
-                    laps_df = extractor.openf1_client.get_laps(session_key=session_key)
-                    if len(laps_df) > 0:
-                        laps_df['session_name'] = session_name
-                        laps_df['meeting_key'] = meeting_name
-                        all_laps.append(laps_df)
-                        print(f"     Laps: {len(laps_df)} records")
-                
-                # Get positions (sample of position data)
-                position_df = extractor.openf1_client.get_position(session_key=session_key)
-                if len(position_df) > 0:
-                    # Take a sample to avoid huge files
-                    position_sample = position_df.sample(n=min(100, len(position_df)))
-                    position_sample['session_name'] = session_name
-                    position_sample['meeting_key'] = meeting_name
-                    all_positions.append(position_sample)
+                if laps_df is not None:
+                    os.makedirs(laps_dir, exist_ok=True)
+                    laps_files += save_dataset(laps_df, f"{laps_dir}/part-{session_key}", emit_csv)
+                    laps_records += len(laps_df)
+                    print(f"     Laps: {len(laps_df)} records")
+                if position_sample is not None:
+                    all_positions.append(pa.Table.from_pandas(position_sample, preserve_index=False))
                     print(f"     Positions: {len(position_sample)} records (sampled)")
-                    
-            except Exception as e:
-                print(f"     ⚠️ Error: {str(e)[:60]}...")
-                continue
+                if error is not None:
+                    print(f"     ⚠️ Error: {str(error)[:60]}...")
         
         # Step 4: Save detailed data to files
         print(f"\n💾 Step 4: Saving detailed data to local files...")
         
         # Save drivers data
         if all_drivers:
-            combined_drivers = pd.concat(all_drivers, ignore_index=True)
-            drivers_file = f"./local-data/drivers/f1_drivers_recent_{timestamp}.csv"
-            combined_drivers.to_csv(drivers_file, index=False)
-            print(f"   ✅ Drivers saved: {drivers_file} ({len(combined_drivers)} records)")
+            combined_drivers = pa.concat_tables(all_drivers, promote_options="permissive")
+            for drivers_file in save_dataset(combined_drivers, f"./local-data/drivers/f1_drivers_recent_{timestamp}", emit_csv):
+                print(f"   ✅ Drivers saved: {drivers_file} ({len(combined_drivers)} records)")
             
-        # Save laps data  
-        if all_laps:
-            combined_laps = pd.concat(all_laps, ignore_index=True)
-            laps_file = f"./local-data/laps/f1_laps_recent_{timestamp}.csv"
-            combined_laps.to_csv(laps_file, index=False)
-            print(f"   ✅ Laps saved: {laps_file} ({len(combined_laps)} records)")
+        # Laps were written per session during extraction
+        if laps_files:
+            print(f"   ✅ Laps saved: {laps_dir}/ ({laps_records} records in {len(laps_files)} files)")
             
         # Save positions data
         if all_positions:
-            combined_positions = pd.concat(all_positions, ignore_index=True)
-            positions_file = f"./local-data/positions/f1_positions_recent_{timestamp}.csv"
-            combined_positions.to_csv(positions_file, index=False)
-            print(f"   ✅ Positions saved: {positions_file} ({len(combined_positions)} records)")
+            combined_positions = pa.concat_tables(all_positions, promote_options="permissive")
+            for positions_file in save_dataset(combined_positions, f"./local-data/positions/f1_positions_recent_{timestamp}", emit_csv):
+                print(f"   ✅ Positions saved: {positions_file} ({len(combined_positions)} records)")
         
         # Step 5: Create summary report
         print(f"\n📋 Step 5: Creating summary report...")
@@ -154,7 +208,7 @@ def run_local_data_pipeline():
             "sessions_count": len(sessions_df),
             "processed_sessions": len(recent_sessions),
             "drivers_records": len(combined_drivers) if all_drivers else 0,
-            "laps_records": len(combined_laps) if all_laps else 0,
+            "laps_records": laps_records,
             "positions_records": len(combined_positions) if all_positions else 0
         }
         
@@ -178,12 +232,13 @@ def run_local_data_pipeline():
         print(f"   ./local-data/meetings/     - F1 meeting information")
         print(f"   ./local-data/sessions/     - Session details")
         print(f"   ./local-data/drivers/      - Driver information")
-        print(f"   ./local-data/laps/         - Lap times and data")
+        print(f"   ./local-data/laps/         - Lap times and data (one file per session)")
         print(f"   ./local-data/positions/    - Position tracking")
         print(f"   ./local-data/*.csv         - Summary reports")
         print()
         print(f"💡 Next steps:")
-        print(f"   • Open CSV files in Excel or your favorite data tool")
+        print(f"   • Load the Parquet files with pandas.read_parquet or DuckDB")
+        print(f"   • Re-run with --emit-csv to also get CSV copies for Excel")
         print(f"   • Use Python/pandas to analyze the data")
         print(f"   • Modify the script to extract more sessions or data types")
         
@@ -196,7 +251,7 @@ def run_local_data_pipeline():
         return False
 
 if __name__ == "__main__":
-    success = run_local_data_pipeline()
+    success = run_local_data_pipeline(emit_csv="--emit-csv" in sys.argv)
     if success:
         print(f"\n🏁 Ready to analyze your F1 data!")
     else:
@@ -4,6 +4,7 @@
 import sys
 import subprocess
 import argparse
+import importlib.util
 from pathlib import Path
 
 
@@ -19,7 +20,9 @@ def run_tests(test_type="all", coverage=True, verbose=False):
     # Add coverage if requested
     if coverage:
         cmd.extend([
-            "--cov=f1_pipeline",
+            "--cov=f1_data_platform",
+            "--cov-branch",
+            "--cov-context=test",
             "--cov-report=term-missing",
             "--cov-report=html:htmlcov"
         ])
@@ -43,6 +46,13 @@ def run_tests(test_type="all", coverage=True, verbose=False):
         cmd.extend(["-m", "not (aws or azure or gcp)"])
     # "all" runs everything
     
+    # Spread isolated test types across CPU workers, one test class (or
+    # module, for bare functions) per worker so class- and module-scoped
+    # fixtures are built once; integration tests may share state, so they
+    # keep running in a single process
+    if test_type in ("unit", "fast") and importlib.util.find_spec("xdist"):
+        cmd.extend(["-n", "auto", "--dist=loadscope"])
+    
     print(f"Running command: {' '.join(cmd)}")
     result = subprocess.run(cmd, cwd=Path(__file__).parent)
     return result.returncode
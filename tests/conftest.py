@@ -1,29 +1,68 @@
 """Test configuration and fixtures."""
 
+import functools
+import importlib.util
+from datetime import datetime, timezone
+from types import SimpleNamespace
 import pytest
-import tempfile
 import os
 import shutil
+import sqlite3
+import tempfile
 from unittest.mock import MagicMock, patch
-import pandas as pd
-from datetime import datetime
 
-from f1_data_platform.config.settings import Settings, StorageConfig, DatabaseConfig
-from f1_data_platform.cloud_swap import CloudProviderFactory
-from f1_data_platform.extractors import OpenF1Client
+try:
+    from sortedcontainers import SortedList
+    SORTEDCONTAINERS_AVAILABLE = True
+except ImportError:
+    SORTEDCONTAINERS_AVAILABLE = False
+
+# pandas, pyarrow and the platform package are imported inside the fixtures
+# and mocks that use them, so narrow or collect-only runs don't load them
+
+
+def _ram_tmp_root():
+    """Return a RAM-backed directory (Linux /dev/shm) if available, else None."""
+    if os.path.ismount("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return None
 
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for testing."""
-    temp_dir = tempfile.mkdtemp()
+def temp_dir(request):
+    """Create a temporary directory for testing, on tmpfs when the platform has one."""
+    ram_root = _ram_tmp_root()
+    if ram_root is None:
+        yield str(request.getfixturevalue("tmp_path"))
+        return
+    
+    temp_dir = tempfile.mkdtemp(dir=ram_root)
     yield temp_dir
-    shutil.rmtree(temp_dir)
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def _template_dir(tmp_path_factory):
+    """Build the empty local storage directory and SQLite file once per test session."""
+    template = tmp_path_factory.mktemp("template")
+    (template / "storage").mkdir()
+    sqlite3.connect(template / "test.db").close()
+    return template
+
+
+@pytest.fixture
+def pipeline_dir(tmp_path, _template_dir):
+    """Per-test working directory seeded from the session template."""
+    work_dir = tmp_path / "work"
+    shutil.copytree(_template_dir, work_dir, dirs_exist_ok=True)
+    return work_dir
 
 
 @pytest.fixture
 def local_settings(temp_dir):
     """Create test settings for local environment."""
+    from f1_data_platform.config.settings import Settings, StorageConfig, DatabaseConfig
+    
     return Settings(
         environment="local",
         storage=StorageConfig(
@@ -37,152 +76,329 @@ def local_settings(temp_dir):
     )
 
 
+@pytest.fixture(scope="session")
+def _base_local_provider(_template_dir):
+    """Construct the local cloud provider once per test session."""
+    from f1_data_platform.config.settings import Settings, StorageConfig, DatabaseConfig
+    from f1_data_platform.cloud_swap import CloudProviderFactory
+    
+    settings = Settings(
+        environment="local",
+        storage=StorageConfig(provider="local", local_path=str(_template_dir / "storage")),
+        database=DatabaseConfig(provider="local", db_path=str(_template_dir / "test.db"))
+    )
+    return CloudProviderFactory.create("local", settings.get_cloud_provider_config())
+
+
 @pytest.fixture
-def mock_cloud_provider(local_settings):
+def local_provider_factory(_base_local_provider):
+    """Hand out fresh providers with the session provider's config, rooted at a given directory."""
+    from f1_data_platform.cloud_swap.providers.local import LocalCloudProvider
+    
+    def _at(base_path):
+        # A new instance rather than a copy: the session provider may hold a
+        # connected SQLite database, and config must carry the new base_path
+        return LocalCloudProvider({**_base_local_provider.config, "base_path": str(base_path)})
+    return _at
+
+
+@pytest.fixture
+def mock_cloud_provider(local_provider_factory, temp_dir):
     """Create a mock cloud provider for testing."""
-    return CloudProviderFactory.create("local", local_settings.get_cloud_provider_config())
+    return local_provider_factory(temp_dir)
+
+
+# WAL with relaxed syncing keeps the shared test database off the fsync path;
+# the exclusive lock is safe because only this session's connection uses it
+_TEST_DB_PRAGMAS = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -64000;
+PRAGMA locking_mode = EXCLUSIVE;
+"""
+
+
+@pytest.fixture(scope="session")
+def db_provider(tmp_path_factory):
+    """One connected SQLite provider shared by the database tests."""
+    from f1_data_platform.cloud_swap.providers.local import LocalDatabaseProvider
+
+    provider = LocalDatabaseProvider(str(tmp_path_factory.mktemp("db") / "test.db"))
+    provider.connect().executescript(_TEST_DB_PRAGMAS)
+    yield provider
+    provider.close()
+
+
+# Sample API payloads. They are converted to typed DataFrames once, on first
+# use; the fixtures below hand each test its own copy.
+_MEETINGS_ROWS = [
+    {
+        "meeting_key": 1219,
+        "meeting_name": "Singapore Grand Prix",
+        "meeting_official_name": "FORMULA 1 SINGAPORE AIRLINES SINGAPORE GRAND PRIX 2023",
+        "location": "Marina Bay",
+        "country_name": "Singapore",
+        "country_code": "SGP",
+        "country_key": 157,
+        "circuit_key": 61,
+        "circuit_short_name": "Singapore",
+        "date_start": datetime(2023, 9, 15, 9, 30, 0, tzinfo=timezone.utc),
+        "gmt_offset": "08:00:00",
+        "year": 2023
+    }
+]
+
+_SESSIONS_ROWS = [
+    {
+        "session_key": 9158,
+        "session_name": "Practice 1",
+        "session_type": "Practice",
+        "meeting_key": 1219,
+        "location": "Marina Bay",
+        "country_name": "Singapore",
+        "country_code": "SGP",
+        "country_key": 157,
+        "circuit_key": 61,
+        "circuit_short_name": "Singapore",
+        "date_start": datetime(2023, 9, 15, 9, 30, 0, tzinfo=timezone.utc),
+        "date_end": datetime(2023, 9, 15, 11, 0, 0, tzinfo=timezone.utc),
+        "gmt_offset": "08:00:00",
+        "year": 2023
+    },
+    {
+        "session_key": 9165,
+        "session_name": "Race",
+        "session_type": "Race",
+        "meeting_key": 1219,
+        "location": "Marina Bay",
+        "country_name": "Singapore",
+        "country_code": "SGP",
+        "country_key": 157,
+        "circuit_key": 61,
+        "circuit_short_name": "Singapore",
+        "date_start": datetime(2023, 9, 17, 13, 0, 0, tzinfo=timezone.utc),
+        "date_end": datetime(2023, 9, 17, 15, 0, 0, tzinfo=timezone.utc),
+        "gmt_offset": "08:00:00",
+        "year": 2023
+    }
+]
+
+_DRIVERS_ROWS = [
+    {
+        "session_key": 9158,
+        "meeting_key": 1219,
+        "driver_number": 1,
+        "broadcast_name": "M VERSTAPPEN",
+        "country_code": "NED",
+        "first_name": "Max",
+        "full_name": "Max VERSTAPPEN",
+        "headshot_url": "https://example.com/verstappen.png",
+        "last_name": "Verstappen",
+        "name_acronym": "VER",
+        "team_colour": "3671C6",
+        "team_name": "Red Bull Racing",
+        "year": 2023
+    },
+    {
+        "session_key": 9158,
+        "meeting_key": 1219,
+        "driver_number": 44,
+        "broadcast_name": "L HAMILTON",
+        "country_code": "GBR",
+        "first_name": "Lewis",
+        "full_name": "Lewis HAMILTON",
+        "headshot_url": "https://example.com/hamilton.png",
+        "last_name": "Hamilton",
+        "name_acronym": "HAM",
+        "team_colour": "00D2BE",
+        "team_name": "Mercedes",
+        "year": 2023
+    }
+]
+
+_LAPS_ROWS = [
+    {
+        "session_key": 9165,
+        "meeting_key": 1219,
+        "driver_number": 1,
+        "date_start": datetime(2023, 9, 17, 13, 0, 30, tzinfo=timezone.utc),
+        "duration_sector_1": 26.5,
+        "duration_sector_2": 38.2,
+        "duration_sector_3": 26.8,
+        "i1_speed": 307,
+        "i2_speed": 277,
+        "is_pit_out_lap": False,
+        "lap_duration": 91.5,
+        "lap_number": 1,
+        "st_speed": 298,
+        "year": 2023
+    },
+    {
+        "session_key": 9165,
+        "meeting_key": 1219,
+        "driver_number": 44,
+        "date_start": datetime(2023, 9, 17, 13, 0, 32, tzinfo=timezone.utc),
+        "duration_sector_1": 26.8,
+        "duration_sector_2": 38.5,
+        "duration_sector_3": 27.1,
+        "i1_speed": 305,
+        "i2_speed": 275,
+        "is_pit_out_lap": False,
+        "lap_duration": 92.4,
+        "lap_number": 1,
+        "st_speed": 296,
+        "year": 2023
+    }
+]
+
+
+def _sample_frame(rows, dtypes):
+    """Build a sample DataFrame with explicit dtypes.
+    
+    Timestamps in the rows are already tz-aware datetimes, so pandas infers
+    datetime64[ns, UTC] columns without parsing strings.
+    """
+    import pandas as pd
+    
+    return pd.DataFrame(rows).astype(dtypes)
+
+
+@functools.lru_cache(maxsize=None)
+def _sample_frames():
+    """Typed sample DataFrames, built on first use and never handed out directly."""
+    return {
+        "meetings": _sample_frame(_MEETINGS_ROWS, {
+            "meeting_key": "int32", "country_key": "int32", "circuit_key": "int32",
+            "country_code": "category", "year": "int16"
+        }),
+        "sessions": _sample_frame(_SESSIONS_ROWS, {
+            "session_key": "int32", "meeting_key": "int32", "country_key": "int32", "circuit_key": "int32",
+            "session_type": "category", "country_code": "category", "year": "int16"
+        }),
+        "drivers": _sample_frame(_DRIVERS_ROWS, {
+            "session_key": "int32", "meeting_key": "int32", "driver_number": "int16",
+            "team_name": "category", "country_code": "category", "year": "int16"
+        }),
+        "laps": _sample_frame(_LAPS_ROWS, {
+            "session_key": "int32", "meeting_key": "int32", "driver_number": "int16", "lap_number": "int32",
+            "i1_speed": "int16", "i2_speed": "int16", "st_speed": "int16", "year": "int16"
+        }),
+    }
 
 
 @pytest.fixture
 def sample_meetings_data():
     """Sample meetings data for testing."""
-    return [
-        {
-            "meeting_key": 1219,
-            "meeting_name": "Singapore Grand Prix",
-            "meeting_official_name": "FORMULA 1 SINGAPORE AIRLINES SINGAPORE GRAND PRIX 2023",
-            "location": "Marina Bay",
-            "country_name": "Singapore",
-            "country_code": "SGP",
-            "country_key": 157,
-            "circuit_key": 61,
-            "circuit_short_name": "Singapore",
-            "date_start": "2023-09-15T09:30:00+00:00",
-            "gmt_offset": "08:00:00",
-            "year": 2023
-        }
-    ]
+    return _sample_frames()["meetings"].copy()
 
 
 @pytest.fixture
 def sample_sessions_data():
     """Sample sessions data for testing."""
-    return [
-        {
-            "session_key": 9158,
-            "session_name": "Practice 1",
-            "session_type": "Practice",
-            "meeting_key": 1219,
-            "location": "Marina Bay",
-            "country_name": "Singapore",
-            "country_code": "SGP",
-            "country_key": 157,
-            "circuit_key": 61,
-            "circuit_short_name": "Singapore",
-            "date_start": "2023-09-15T09:30:00+00:00",
-            "date_end": "2023-09-15T11:00:00+00:00",
-            "gmt_offset": "08:00:00",
-            "year": 2023
-        },
-        {
-            "session_key": 9165,
-            "session_name": "Race",
-            "session_type": "Race",
-            "meeting_key": 1219,
-            "location": "Marina Bay",
-            "country_name": "Singapore",
-            "country_code": "SGP",
-            "country_key": 157,
-            "circuit_key": 61,
-            "circuit_short_name": "Singapore",
-            "date_start": "2023-09-17T13:00:00+00:00",
-            "date_end": "2023-09-17T15:00:00+00:00",
-            "gmt_offset": "08:00:00",
-            "year": 2023
-        }
-    ]
+    return _sample_frames()["sessions"].copy()
 
 
 @pytest.fixture
 def sample_drivers_data():
     """Sample drivers data for testing."""
-    return [
-        {
-            "session_key": 9158,
-            "meeting_key": 1219,
-            "driver_number": 1,
-            "broadcast_name": "M VERSTAPPEN",
-            "country_code": "NED",
-            "first_name": "Max",
-            "full_name": "Max VERSTAPPEN",
-            "headshot_url": "https://example.com/verstappen.png",
-            "last_name": "Verstappen",
-            "name_acronym": "VER",
-            "team_colour": "3671C6",
-            "team_name": "Red Bull Racing",
-            "year": 2023
-        },
-        {
-            "session_key": 9158,
-            "meeting_key": 1219,
-            "driver_number": 44,
-            "broadcast_name": "L HAMILTON",
-            "country_code": "GBR",
-            "first_name": "Lewis",
-            "full_name": "Lewis HAMILTON",
-            "headshot_url": "https://example.com/hamilton.png",
-            "last_name": "Hamilton",
-            "name_acronym": "HAM",
-            "team_colour": "00D2BE",
-            "team_name": "Mercedes",
-            "year": 2023
-        }
-    ]
+    return _sample_frames()["drivers"].copy()
 
 
 @pytest.fixture
 def sample_laps_data():
     """Sample laps data for testing."""
-    return [
+    return _sample_frames()["laps"].copy()
+
+
+@pytest.fixture
+def sample_laps_records(sample_laps_data):
+    """Sample laps data as a list of dicts, for tests that need row records."""
+    return sample_laps_data.to_dict("records")
+
+
+@pytest.fixture(scope="session")
+def integration_frames():
+    """Small API-shaped frames shared by the integration tests.
+    
+    They are numpy-backed, matching what OpenF1Client returns. Tests must
+    treat them as read-only and take .copy() before mutating.
+    """
+    import pandas as pd
+    
+    meetings = pd.DataFrame([{
+        "meeting_key": 1219,
+        "meeting_name": "Test Grand Prix",
+        "year": 2023,
+        "circuit_short_name": "Test Circuit",
+        "date_start": "2023-01-01T10:00:00+00:00"
+    }])
+    
+    sessions = pd.DataFrame([{
+        "session_key": 9001,
+        "meeting_key": 1219,
+        "session_name": "Race",
+        "session_type": "Race",
+        "year": 2023,
+        "date_start": "2023-01-01T14:00:00+00:00"
+    }])
+    
+    drivers = pd.DataFrame([
         {
-            "session_key": 9165,
+            "session_key": 9001,
             "meeting_key": 1219,
             "driver_number": 1,
-            "date_start": "2023-09-17T13:00:30+00:00",
-            "duration_sector_1": 26.5,
-            "duration_sector_2": 38.2,
-            "duration_sector_3": 26.8,
-            "i1_speed": 307,
-            "i2_speed": 277,
-            "is_pit_out_lap": False,
-            "lap_duration": 91.5,
-            "lap_number": 1,
-            "st_speed": 298,
+            "full_name": "Test Driver 1",
+            "name_acronym": "TD1",
+            "team_name": "Test Team 1",
             "year": 2023
         },
         {
-            "session_key": 9165,
+            "session_key": 9001,
             "meeting_key": 1219,
-            "driver_number": 44,
-            "date_start": "2023-09-17T13:00:32+00:00",
-            "duration_sector_1": 26.8,
-            "duration_sector_2": 38.5,
-            "duration_sector_3": 27.1,
-            "i1_speed": 305,
-            "i2_speed": 275,
-            "is_pit_out_lap": False,
-            "lap_duration": 92.4,
-            "lap_number": 1,
-            "st_speed": 296,
+            "driver_number": 2,
+            "full_name": "Test Driver 2",
+            "name_acronym": "TD2",
+            "team_name": "Test Team 2",
             "year": 2023
         }
-    ]
+    ])
+    
+    return SimpleNamespace(
+        meetings=meetings,
+        sessions=sessions,
+        drivers=drivers,
+        tiny=pd.DataFrame({"test": ["data"]}),
+        consistency=pd.DataFrame({
+            "id": [1, 2, 3],
+            "value": [10.5, 20.3, 15.7],
+            "category": ["A", "B", "A"]
+        })
+    )
+
+
+@pytest.fixture(scope="session")
+def schema_manager():
+    """Shared SchemaManager; its schema definitions are static."""
+    from f1_data_platform.models.schemas import SchemaManager
+    
+    return SchemaManager()
+
+
+@pytest.fixture(scope="session")
+def _openf1_template():
+    """Spec'd OpenF1Client mock, built once; spec introspection is the costly part."""
+    from f1_data_platform.extractors import OpenF1Client
+    
+    return MagicMock(spec=OpenF1Client)
 
 
 @pytest.fixture
-def mock_openf1_client():
+def mock_openf1_client(_openf1_template):
     """Create a mock OpenF1 client for testing."""
-    client = MagicMock(spec=OpenF1Client)
+    client = _openf1_template
+    # Clear calls, return values and side effects left by the previous test
+    client.reset_mock(return_value=True, side_effect=True)
     
     # Configure default return values
     client.health_check.return_value = {
@@ -220,14 +436,19 @@ class MockDatabase:
     def execute_many(self, query, params):
         return MagicMock()
     
-    def fetch_dataframe(self, query, params=None):
+    def fetch_dataframe(self, query, params=None, dtype=None):
+        import pandas as pd
         return pd.DataFrame()
     
+    def fetch_dataframe_chunks(self, query, params=None, chunksize=200_000):
+        return iter([])
+    
     def insert_dataframe(self, df, table_name, if_exists="append"):
         self.tables[table_name] = df
         return True
     
     def create_table(self, table_name, schema):
+        import pandas as pd
         self.tables[table_name] = pd.DataFrame()
         return True
     
@@ -246,29 +467,50 @@ class MockStorage:
     
     def __init__(self):
         self.files = {}
+        # Sorted key index so prefix listings don't scan every key
+        self._keys = SortedList() if SORTEDCONTAINERS_AVAILABLE else None
+    
+    def _store(self, remote_path, payload):
+        if self._keys is not None and remote_path not in self.files:
+            self._keys.add(remote_path)
+        self.files[remote_path] = payload
     
     def upload_file(self, local_path, remote_path):
-        self.files[remote_path] = local_path
+        self._store(remote_path, local_path)
         return True
     
     def download_file(self, remote_path, local_path):
         return remote_path in self.files
     
     def upload_dataframe(self, df, remote_path, format="parquet"):
-        self.files[remote_path] = df
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        # Keep a serialized copy, like real storage, rather than the live frame
+        buffer = pa.BufferOutputStream()
+        pq.write_table(pa.Table.from_pandas(df), buffer, compression="zstd")
+        self._store(remote_path, buffer.getvalue())
         return True
     
     def download_dataframe(self, remote_path, format="parquet"):
-        if remote_path in self.files and isinstance(self.files[remote_path], pd.DataFrame):
-            return self.files[remote_path]
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        if remote_path in self.files and isinstance(self.files[remote_path], pa.Buffer):
+            return pq.read_table(pa.BufferReader(self.files[remote_path])).to_pandas()
         return pd.DataFrame()
     
     def list_files(self, prefix=""):
-        return [f for f in self.files.keys() if f.startswith(prefix)]
+        if self._keys is not None:
+            return list(self._keys.irange(prefix, prefix + "\uffff"))
+        return sorted(f for f in self.files if f.startswith(prefix))
     
     def delete_file(self, remote_path):
         if remote_path in self.files:
             del self.files[remote_path]
+            if self._keys is not None:
+                self._keys.remove(remote_path)
             return True
         return False
     
@@ -276,7 +518,11 @@ class MockStorage:
         return remote_path in self.files
     
     def get_file_size(self, remote_path):
-        return 1000 if remote_path in self.files else 0
+        if remote_path not in self.files:
+            return 0
+        payload = self.files[remote_path]
+        # upload_file records the local path; DataFrames are stored as Arrow buffers
+        return 1000 if isinstance(payload, str) else payload.size
 
 
 @pytest.fixture
@@ -293,38 +539,95 @@ def mock_storage():
 
 # AWS Mocking fixtures
 
+def _configure_boto3_mock(mock_client):
+    """Reset the shared boto3.client mock to a fresh S3 client with default responses."""
+    mock_client.reset_mock(return_value=True, side_effect=True)
+    mock_s3 = MagicMock()
+    mock_s3.upload_file.return_value = None
+    mock_s3.download_file.return_value = None
+    mock_s3.list_objects_v2.return_value = {"Contents": []}
+    mock_s3.head_object.return_value = {"ContentLength": 1000}
+    mock_client.return_value = mock_s3
+    return mock_s3
+
+
+def _configure_engine_mock(mock_engine):
+    """Reset the shared create_engine mock to a fresh engine with a context-managed connection."""
+    mock_engine.reset_mock(return_value=True, side_effect=True)
+    engine = MagicMock()
+    engine.connect.return_value.__enter__ = MagicMock(return_value=MagicMock())
+    engine.connect.return_value.__exit__ = MagicMock(return_value=None)
+    mock_engine.return_value = engine
+    return engine
+
+
 @pytest.fixture
-def mock_boto3_client():
+def mock_boto3_client(request):
     """Mock boto3 client for AWS testing."""
-    with patch('boto3.client') as mock_client:
-        mock_s3 = MagicMock()
-        mock_s3.upload_file.return_value = None
-        mock_s3.download_file.return_value = None
-        mock_s3.list_objects_v2.return_value = {"Contents": []}
-        mock_s3.head_object.return_value = {"ContentLength": 1000}
-        
-        mock_client.return_value = mock_s3
-        yield mock_s3
+    if request.config._boto3_client_mock is None:
+        pytest.skip("boto3 not installed")
+    return _configure_boto3_mock(request.config._boto3_client_mock)
 
 
 @pytest.fixture
-def mock_sqlalchemy_engine():
+def mock_sqlalchemy_engine(request):
     """Mock SQLAlchemy engine for database testing."""
-    with patch('sqlalchemy.create_engine') as mock_engine:
-        engine = MagicMock()
-        engine.connect.return_value.__enter__ = MagicMock(return_value=MagicMock())
-        engine.connect.return_value.__exit__ = MagicMock(return_value=None)
-        mock_engine.return_value = engine
-        yield engine
+    if request.config._create_engine_mock is None:
+        pytest.skip("SQLAlchemy not installed")
+    return _configure_engine_mock(request.config._create_engine_mock)
 
 
 # Pytest configuration
 
+def pytest_addoption(parser):
+    """Add the --fast option for quick local iterations."""
+    parser.addoption(
+        "--fast",
+        action="store_true",
+        default=False,
+        help="Deselect tests marked slow; combine with --lf --nf to re-run failures first",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Drop slow tests from the run when --fast is given."""
+    if not config.getoption("--fast"):
+        return
+    
+    selected = [item for item in items if "slow" not in item.keywords]
+    deselected = [item for item in items if "slow" in item.keywords]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
 def pytest_configure(config):
-    """Configure pytest with custom markers."""
-    config.addinivalue_line("markers", "unit: mark test as a unit test")
-    config.addinivalue_line("markers", "integration: mark test as an integration test")
-    config.addinivalue_line("markers", "aws: mark test as AWS-specific")
-    config.addinivalue_line("markers", "azure: mark test as Azure-specific")
-    config.addinivalue_line("markers", "gcp: mark test as GCP-specific")
-    config.addinivalue_line("markers", "slow: mark test as slow running")
\ No newline at end of file
+    """Start session-wide client patches (markers are declared in pyproject.toml)."""
+    # Keep SQLite's temporary files in RAM alongside the tmpfs temp_dir
+    ram_root = _ram_tmp_root()
+    if ram_root is not None:
+        os.environ.setdefault("SQLITE_TMPDIR", ram_root)
+    
+    # boto3.client and sqlalchemy.create_engine are patched once for the whole
+    # run; the fixtures above reset the shared mocks for each test that uses them.
+    # A patch is skipped when its module isn't installed, so the suite still
+    # starts without the cloud extras.
+    config._boto3_client_patcher = config._boto3_client_mock = None
+    if importlib.util.find_spec("boto3") is not None:
+        config._boto3_client_patcher = patch('boto3.client')
+        config._boto3_client_mock = config._boto3_client_patcher.start()
+        _configure_boto3_mock(config._boto3_client_mock)
+    
+    config._create_engine_patcher = config._create_engine_mock = None
+    if importlib.util.find_spec("sqlalchemy") is not None:
+        config._create_engine_patcher = patch('sqlalchemy.create_engine')
+        config._create_engine_mock = config._create_engine_patcher.start()
+        _configure_engine_mock(config._create_engine_mock)
+
+
+def pytest_unconfigure(config):
+    """Stop the session-wide client patches."""
+    for patcher_name in ("_boto3_client_patcher", "_create_engine_patcher"):
+        patcher = getattr(config, patcher_name, None)
+        if patcher is not None:
+            patcher.stop()
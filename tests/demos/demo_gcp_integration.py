@@ -12,11 +12,12 @@ import os
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def main():
-    print("🟢 F1 Pipeline GCP Integration Demo")
-    print("=" * 50)
+def run_demo(out):
+    """Run the demo, emitting each output line through out()."""
+    out("🟢 F1 Pipeline GCP Integration Demo")
+    out("=" * 50)
     
-    print("\n1. 📝 Loading GCP configuration...")
+    out("\n1. 📝 Loading GCP configuration...")
     
     # Simulate GCP configuration (what would come from gcp.yaml)
     gcp_config = {
@@ -42,12 +43,12 @@ def main():
         }
     }
     
-    print(f"   ✅ Environment: {gcp_config['environment']}")
-    print(f"   ✅ Storage Provider: {gcp_config['storage']['provider']}")
-    print(f"   ✅ Database Provider: {gcp_config['database']['provider']}")
-    print(f"   ✅ Compute Provider: {gcp_config['compute']['provider']}")
+    out(f"   ✅ Environment: {gcp_config['environment']}")
+    out(f"   ✅ Storage Provider: {gcp_config['storage']['provider']}")
+    out(f"   ✅ Database Provider: {gcp_config['database']['provider']}")
+    out(f"   ✅ Compute Provider: {gcp_config['compute']['provider']}")
     
-    print("\n2. 🏗️  Initializing cloud provider...")
+    out("\n2. 🏗️  Initializing cloud provider...")
     
     try:
         from f1_data_platform.cloud_swap import get_cloud_provider
@@ -56,65 +57,74 @@ def main():
         # The cloud_swap module handles all GCP-specific code automatically
         provider = get_cloud_provider("gcp", gcp_config)
         
-        print(f"   ✅ Cloud provider created: {type(provider).__name__}")
+        out(f"   ✅ Cloud provider created: {type(provider).__name__}")
         
         # Test provider components
         try:
             storage = provider.get_storage_provider()
-            print(f"   ✅ Storage provider: {type(storage).__name__}")
+            out(f"   ✅ Storage provider: {type(storage).__name__}")
         except Exception as e:
-            print(f"   ⚠️  GCP dependencies not installed: {e}")
-            print("   💡 In production CI/CD, these would be pre-installed")
+            out(f"   ⚠️  GCP dependencies not installed: {e}")
+            out("   💡 In production CI/CD, these would be pre-installed")
         
         try:
             database = provider.get_database_provider()
-            print(f"   ✅ Database provider: {type(database).__name__}")
+            out(f"   ✅ Database provider: {type(database).__name__}")
         except Exception as e:
-            print(f"   ⚠️  Database connection simulation: {e}")
+            out(f"   ⚠️  Database connection simulation: {e}")
         
         try:
             compute = provider.get_compute_provider()
-            print(f"   ✅ Compute provider: {type(compute).__name__}")
+            out(f"   ✅ Compute provider: {type(compute).__name__}")
         except Exception as e:
-            print(f"   ⚠️  Compute provider simulation: {e}")
+            out(f"   ⚠️  Compute provider simulation: {e}")
             
     except ImportError as e:
-        print(f"   ⚠️  GCP dependencies not installed: {e}")
-        print("   💡 In production CI/CD, these would be pre-installed")
+        out(f"   ⚠️  GCP dependencies not installed: {e}")
+        out("   💡 In production CI/CD, these would be pre-installed")
     except Exception as e:
-        print(f"   ❌ Error: {e}")
+        out(f"   ❌ Error: {e}")
     
-    print("\n3. 🚀 CI/CD Usage Example:")
-    print("   In your CI/CD pipeline, you would simply:")
-    print("   ```bash")
-    print("   # Set environment variables")
-    print("   export F1_DB_PASSWORD=${{ secrets.GCP_DB_PASSWORD }}")
-    print("   export GOOGLE_APPLICATION_CREDENTIALS=${{ secrets.GCP_SERVICE_ACCOUNT_KEY }}")
-    print("   ")
-    print("   # Install dependencies")
-    print("   pip install -r requirements.txt")
-    print("   ")
-    print("   # Run with GCP config - NO CODE CHANGES!")
-    print("   python run_f1_data_platform.py --config config/gcp.yaml")
-    print("   ```")
+    out("\n3. 🚀 CI/CD Usage Example:")
+    out("   In your CI/CD pipeline, you would simply:")
+    out("   ```bash")
+    out("   # Set environment variables")
+    out("   export F1_DB_PASSWORD=${{ secrets.GCP_DB_PASSWORD }}")
+    out("   export GOOGLE_APPLICATION_CREDENTIALS=${{ secrets.GCP_SERVICE_ACCOUNT_KEY }}")
+    out("   ")
+    out("   # Install dependencies")
+    out("   pip install -r requirements.txt")
+    out("   ")
+    out("   # Run with GCP config - NO CODE CHANGES!")
+    out("   python run_f1_data_platform.py --config config/gcp.yaml")
+    out("   ```")
     
-    print("\n4. 🔄 Multi-Cloud Flexibility:")
-    print("   The same codebase supports all environments:")
-    print("   • Local development: environment=local")
-    print("   • AWS production: environment=aws") 
-    print("   • Azure production: environment=azure")
-    print("   • GCP staging: environment=gcp")
-    print("   ")
-    print("   🎯 Zero code changes - just configuration!")
+    out("\n4. 🔄 Multi-Cloud Flexibility:")
+    out("   The same codebase supports all environments:")
+    out("   • Local development: environment=local")
+    out("   • AWS production: environment=aws") 
+    out("   • Azure production: environment=azure")
+    out("   • GCP staging: environment=gcp")
+    out("   ")
+    out("   🎯 Zero code changes - just configuration!")
     
-    print("\n5. 🛡️  GCP Authentication Options:")
-    print("   • Application Default Credentials (recommended for CI/CD)")
-    print("   • Service account key file")
-    print("   • Workload Identity (for GKE)")
-    print("   • User credentials (for development)")
+    out("\n5. 🛡️  GCP Authentication Options:")
+    out("   • Application Default Credentials (recommended for CI/CD)")
+    out("   • Service account key file")
+    out("   • Workload Identity (for GKE)")
+    out("   • User credentials (for development)")
     
-    print("\n✅ GCP integration demo complete!")
-    print("🎉 Ready for production CI/CD deployment!")
+    out("\n✅ GCP integration demo complete!")
+    out("🎉 Ready for production CI/CD deployment!")
+
+def main():
+    # Collect the demo output and write it in one go rather than one print per line
+    lines = []
+    try:
+        run_demo(lines.append)
+    finally:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
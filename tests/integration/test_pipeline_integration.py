@@ -1,10 +1,10 @@
 """Integration tests for the complete pipeline."""
 
+import copy
+import time
 import pytest
-import os
-import tempfile
-import shutil
 from unittest.mock import patch, MagicMock
+import numpy as np
 import pandas as pd
 
 from f1_data_platform.config.settings import Settings, StorageConfig, DatabaseConfig
@@ -13,40 +13,79 @@ from f1_data_platform.extractors import DataExtractor
 from f1_data_platform.transformers import DataTransformer, AIPreparationTransformer
 
 
+def frames_equal_fast(a, b):
+    """Cheap equality check: same columns, dtypes and row hashes in the same order."""
+    return (
+        a.columns.equals(b.columns)
+        and a.dtypes.equals(b.dtypes)
+        and len(a) == len(b)
+        and np.array_equal(pd.util.hash_pandas_object(a, index=True).to_numpy(),
+                           pd.util.hash_pandas_object(b, index=True).to_numpy())
+    )
+
+
+def assert_frames_equal(a, b):
+    """Assert two frames are equal, only running the elementwise comparison on mismatch."""
+    if not frames_equal_fast(a, b):
+        pd.testing.assert_frame_equal(a, b)
+
+
+@pytest.fixture(scope="session", params=[100, 10000], ids=["small", "medium"])
+def sized_df(request):
+    """Single-column dataset of each tested size, built once per session."""
+    return pd.DataFrame({"data": np.arange(request.param, dtype=np.int32)})
+
+
+def _local_settings(work_dir):
+    """Local settings with storage and database under work_dir."""
+    return Settings(
+        environment="local",
+        storage=StorageConfig(provider="local", local_path=str(work_dir / "storage")),
+        database=DatabaseConfig(provider="local", db_path=str(work_dir / "test.db"))
+    )
+
+
+@pytest.fixture(scope="session")
+def _pipeline_prototype(_template_dir, _base_local_provider):
+    """Build the pipeline components once per session against the template directory."""
+    settings = _local_settings(_template_dir)
+    return {
+        "extractor": DataExtractor(settings, _base_local_provider),
+        "transformer": DataTransformer(settings, _base_local_provider),
+        "ai_transformer": AIPreparationTransformer(settings, _base_local_provider)
+    }
+
+
+@pytest.fixture
+def pipeline_setup(_pipeline_prototype, pipeline_dir, local_provider_factory):
+    """Setup a complete pipeline for testing."""
+    settings = _local_settings(pipeline_dir)
+    cloud_provider = local_provider_factory(pipeline_dir / "storage")
+    
+    components = {
+        "temp_dir": str(pipeline_dir),
+        "settings": settings,
+        "cloud_provider": cloud_provider
+    }
+    # Shallow-copy the prebuilt components and rebind them to this test's
+    # paths; the OpenF1 client (and its HTTP session) is shared
+    for name, prototype in _pipeline_prototype.items():
+        component = copy.copy(prototype)
+        component.settings = settings
+        component.cloud_provider = cloud_provider
+        component.storage = cloud_provider.get_storage_provider()
+        component.database = cloud_provider.get_database_provider()
+        components[name] = component
+    
+    return components
+
+
 @pytest.mark.integration
 class TestPipelineIntegration:
     """Integration tests for the complete pipeline."""
     
-    @pytest.fixture
-    def pipeline_setup(self):
-        """Setup a complete pipeline for testing."""
-        temp_dir = tempfile.mkdtemp()
-        
-        settings = Settings(
-            environment="local",
-            storage=StorageConfig(provider="local", local_path=temp_dir),
-            database=DatabaseConfig(provider="local", db_path=os.path.join(temp_dir, "test.db"))
-        )
-        
-        cloud_provider = CloudProviderFactory.create("local", settings.get_cloud_provider_config())
-        
-        extractor = DataExtractor(settings, cloud_provider)
-        transformer = DataTransformer(settings, cloud_provider)
-        ai_transformer = AIPreparationTransformer(settings, cloud_provider)
-        
-        yield {
-            "temp_dir": temp_dir,
-            "settings": settings,
-            "cloud_provider": cloud_provider,
-            "extractor": extractor,
-            "transformer": transformer,
-            "ai_transformer": ai_transformer
-        }
-        
-        # Cleanup
-        shutil.rmtree(temp_dir)
-    
-    def test_complete_pipeline_flow(self, pipeline_setup):
+    @pytest.mark.slow
+    def test_complete_pipeline_flow(self, pipeline_setup, integration_frames):
         """Test the complete pipeline from extraction to AI preparation."""
         components = pipeline_setup
         extractor = components["extractor"]
@@ -56,52 +95,13 @@ class TestPipelineIntegration:
         # Mock the OpenF1 client to return test data
         with patch.object(extractor, 'openf1_client') as mock_client:
             
-            # Setup mock data
-            mock_meetings = pd.DataFrame([{
-                "meeting_key": 1219,
-                "meeting_name": "Test Grand Prix",
-                "year": 2023,
-                "circuit_short_name": "Test Circuit",
-                "date_start": "2023-01-01T10:00:00+00:00"
-            }])
-            
-            mock_sessions = pd.DataFrame([{
-                "session_key": 9001,
-                "meeting_key": 1219,
-                "session_name": "Race",
-                "session_type": "Race",
-                "year": 2023,
-                "date_start": "2023-01-01T14:00:00+00:00"
-            }])
-            
-            mock_drivers = pd.DataFrame([
-                {
-                    "session_key": 9001,
-                    "meeting_key": 1219,
-                    "driver_number": 1,
-                    "full_name": "Test Driver 1",
-                    "name_acronym": "TD1",
-                    "team_name": "Test Team 1",
-                    "year": 2023
-                },
-                {
-                    "session_key": 9001,
-                    "meeting_key": 1219,
-                    "driver_number": 2,
-                    "full_name": "Test Driver 2",
-                    "name_acronym": "TD2",
-                    "team_name": "Test Team 2",
-                    "year": 2023
-                }
-            ])
-            
             # Configure mock client
-            def mock_get_all_data_for_year(year):
-                yield ("meetings", mock_meetings)
-                yield ("sessions", mock_sessions)
-                yield ("drivers", mock_drivers)
-            
-            mock_client.get_all_data_for_year.side_effect = mock_get_all_data_for_year
+            payload = (
+                ("meetings", integration_frames.meetings),
+                ("sessions", integration_frames.sessions),
+                ("drivers", integration_frames.drivers)
+            )
+            mock_client.get_all_data_for_year.side_effect = lambda year: iter(payload)
             
             # Step 1: Extract raw data
             extractor.create_raw_data_tables()
@@ -157,6 +157,34 @@ class TestPipelineIntegration:
             stats = extractor.extract_year_data(2023)
             assert stats["errors"] > 0
     
+    def test_raw_files_share_endpoint_types(self, pipeline_setup):
+        """Test that raw files of one endpoint are written with the same column types."""
+        import pyarrow.parquet as pq
+        
+        components = pipeline_setup
+        extractor = components["extractor"]
+        storage = extractor.storage
+        
+        # Without a fixed dtype map the NaN makes i1_speed float64 in one year
+        # and int64 in the other
+        laps_by_year = {
+            2022: pd.DataFrame({"session_key": [1], "lap_number": [1], "i1_speed": [280]}),
+            2023: pd.DataFrame({"session_key": [2], "lap_number": [1], "i1_speed": [np.nan]})
+        }
+        with patch.object(extractor.openf1_client, 'get_all_data_for_year') as mock_get_data:
+            mock_get_data.side_effect = lambda year: iter([("laps", laps_by_year[year])])
+            for year in laps_by_year:
+                assert extractor.extract_year_data(year, save_to_db=False)["errors"] == 0
+        
+        schemas = [
+            pq.read_schema(storage._get_full_path(path))
+            for path in storage.list_files("raw-data/")
+        ]
+        assert len(schemas) == 2
+        assert schemas[0].equals(schemas[1])
+        assert str(schemas[0].field("lap_number").type) == "int64"
+        assert str(schemas[0].field("i1_speed").type) == "double"
+    
     def test_configuration_validation(self):
         """Test configuration validation."""
         # Test valid configuration
@@ -190,7 +218,7 @@ class TestPipelineIntegration:
         
         retrieved_df = storage.download_dataframe("large_test.parquet")
         assert len(retrieved_df) == 10000
-        pd.testing.assert_frame_equal(large_df, retrieved_df)
+        assert_frames_equal(large_df, retrieved_df)
 
 
 @pytest.mark.integration 
@@ -263,72 +291,60 @@ class TestAWSIntegration:
 
 
 @pytest.mark.integration
+@pytest.mark.slow
 class TestPerformanceMetrics:
     """Integration tests for performance monitoring."""
     
-    def test_extraction_performance(self, pipeline_setup):
+    def test_extraction_performance(self, pipeline_setup, integration_frames):
         """Test extraction performance metrics."""
         components = pipeline_setup
         extractor = components["extractor"]
         
         # Mock small dataset
         with patch.object(extractor.openf1_client, 'get_all_data_for_year') as mock_get_data:
-            small_df = pd.DataFrame([{"test": "data"}])
-            mock_get_data.return_value = [("test_endpoint", small_df)]
+            mock_get_data.return_value = [("test_endpoint", integration_frames.tiny)]
             
-            import time
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             stats = extractor.extract_year_data(2023)
-            end_time = time.time()
+            elapsed_ns = time.perf_counter_ns() - start_ns
             
             # Basic performance assertions
-            assert (end_time - start_time) < 10  # Should complete within 10 seconds
+            assert elapsed_ns < 10_000_000_000  # Should complete within 10 seconds
             assert stats["total_records"] >= 0
     
-    def test_memory_usage(self, pipeline_setup):
+    def test_memory_usage(self, pipeline_setup, sized_df):
         """Test memory usage during processing."""
         components = pipeline_setup
         storage = components["cloud_provider"].get_storage_provider()
+        remote_path = f"sized_{len(sized_df)}.parquet"
         
-        # Test with different sized datasets
-        small_df = pd.DataFrame({"data": range(100)})
-        medium_df = pd.DataFrame({"data": range(10000)})
-        
-        # Both should complete successfully
-        assert storage.upload_dataframe(small_df, "small.parquet") is True
-        assert storage.upload_dataframe(medium_df, "medium.parquet") is True
+        # Each dataset size should complete successfully
+        assert storage.upload_dataframe(sized_df, remote_path) is True
         
         # Verify retrieval
-        retrieved_small = storage.download_dataframe("small.parquet")
-        retrieved_medium = storage.download_dataframe("medium.parquet")
-        
-        assert len(retrieved_small) == 100
-        assert len(retrieved_medium) == 10000
+        retrieved = storage.download_dataframe(remote_path)
+        assert len(retrieved) == len(sized_df)
 
 
 @pytest.mark.integration
 class TestDataQuality:
     """Integration tests for data quality and validation."""
     
-    def test_data_consistency(self, pipeline_setup):
+    def test_data_consistency(self, pipeline_setup, integration_frames):
         """Test data consistency through the pipeline."""
         components = pipeline_setup
         storage = components["cloud_provider"].get_storage_provider()
         database = components["cloud_provider"].get_database_provider()
         
         # Create test data with known characteristics
-        test_data = pd.DataFrame({
-            "id": [1, 2, 3],
-            "value": [10.5, 20.3, 15.7],
-            "category": ["A", "B", "A"]
-        })
+        test_data = integration_frames.consistency
         
         # Store and retrieve through storage
         storage.upload_dataframe(test_data, "test_consistency.parquet")
         retrieved_data = storage.download_dataframe("test_consistency.parquet")
         
         # Verify consistency
-        pd.testing.assert_frame_equal(test_data, retrieved_data)
+        assert_frames_equal(test_data, retrieved_data)
         
         # Store and retrieve through database
         database.create_table("test_table", {
@@ -343,12 +359,8 @@ class TestDataQuality:
         assert len(db_data) == len(test_data)
         assert set(db_data.columns) == set(test_data.columns)
     
-    def test_schema_validation(self, pipeline_setup):
+    def test_schema_validation(self, pipeline_setup, schema_manager):
         """Test schema validation during data processing."""
-        from f1_data_platform.models.schemas import SchemaManager
-        
-        schema_manager = SchemaManager()
-        
         # Test valid data
         valid_data = {
             "meeting_key": 1219,
@@ -0,0 +1,119 @@
+"""Unit tests for the analytics transformer."""
+
+import pytest
+import pandas as pd
+
+from f1_data_platform.cloud_swap import CloudProviderFactory
+from f1_data_platform.transformers import DataTransformer
+
+
+@pytest.fixture
+def transformer(temp_dir, local_settings):
+    """DataTransformer over a local provider rooted in temp_dir."""
+    cloud_provider = CloudProviderFactory.create("local", {"base_path": temp_dir})
+    transformer = DataTransformer(local_settings, cloud_provider)
+    yield transformer
+    transformer.database.close()
+
+
+def _seed_race(database, year, session_key, meeting_key, race_date):
+    """Load one race's raw tables: four classified drivers, one of them unknown to raw_drivers."""
+    tables = {
+        "raw_meetings": pd.DataFrame({
+            "meeting_key": [meeting_key],
+            "meeting_name": [f"Grand Prix {meeting_key}"],
+            "circuit_short_name": ["Circuit"],
+            "date_start": [race_date]
+        }),
+        "raw_sessions": pd.DataFrame({
+            "session_key": [session_key],
+            "meeting_key": [meeting_key],
+            "session_type": ["Race"],
+            "date_start": [race_date],
+            "year": [year]
+        }),
+        "raw_session_result": pd.DataFrame({
+            "session_key": [session_key] * 4,
+            "driver_number": [1, 44, 16, 99],
+            "position": [1, 2, 11, 12],
+            "dnf": [False] * 4,
+            "dns": [False] * 4,
+            "dsq": [False] * 4
+        }),
+        # Driver 1 appears twice; the first row wins
+        "raw_drivers": pd.DataFrame({
+            "session_key": [session_key] * 4,
+            "driver_number": [1, 1, 44, 16],
+            "full_name": ["Max Verstappen", "Duplicate", "Lewis Hamilton", "Charles Leclerc"],
+            "name_acronym": ["VER", "DUP", "HAM", "LEC"],
+            "team_name": ["Red Bull Racing", "Duplicate", "Mercedes", "Ferrari"]
+        }),
+        "raw_starting_grid": pd.DataFrame({
+            "session_key": [session_key] * 3,
+            "driver_number": [44, 1, 16],
+            "position": [1, 2, 3]
+        }),
+        # Driver 44 has no timed laps
+        "raw_laps": pd.DataFrame({
+            "session_key": [session_key] * 4,
+            "driver_number": [1, 1, 16, 16],
+            "lap_duration": [91.5, 90.1, 92.0, None]
+        })
+    }
+    for table_name, df in tables.items():
+        assert database.insert_dataframe(df, table_name)
+
+
+class TestGrandPrixResults:
+    """Test the per-driver lookup joins in transform_grand_prix_results."""
+    
+    def test_joined_results_frame(self, transformer):
+        """Test columns, dtypes and fastest-lap handling of the joined results."""
+        _seed_race(transformer.database, 2023, 9158, 1219, "2023-09-17")
+        
+        results = transformer.transform_grand_prix_results(2023).set_index("driver_number")
+        
+        # Driver 99 has a result but no raw_drivers row, so the inner join drops it
+        assert sorted(results.index) == [1, 16, 44]
+        assert {
+            "result_id", "date", "year", "grand_prix", "circuit_name", "driver_name",
+            "driver_acronym", "team_name", "starting_grid_position", "final_position",
+            "points", "fastest_lap", "total_time_penalty", "dnf", "dns", "dsq",
+            "total_season_points", "drivers_championship_ranking", "points_from_first"
+        } <= set(results.columns)
+        assert results.index.dtype == "int64"
+        assert results.loc[1, "driver_name"] == "Max Verstappen"
+        assert results.loc[1, "result_id"] == "2023_1_1"
+        assert results.loc[44, "starting_grid_position"] == 1
+        assert results["final_position"].dtype == "int64"
+        assert results["fastest_lap"].dtype == "float64"
+        assert results["total_time_penalty"].dtype == "float64"
+        
+        # Fastest lap is the driver's best timed lap, NaN without one
+        assert results.loc[1, "fastest_lap"] == 90.1
+        assert results.loc[16, "fastest_lap"] == 92.0
+        assert pd.isna(results.loc[44, "fastest_lap"])
+        
+        # The fastest-lap point only goes to top-ten finishers with a timed lap
+        assert results.loc[1, "points"] == 26
+        assert results.loc[44, "points"] == 18
+        assert results.loc[16, "points"] == 0
+
+
+class TestSaveAnalyticsDataYears:
+    """Test saving several years from parallel worker processes."""
+    
+    def test_two_years_into_sqlite(self, transformer):
+        """Test that two worker processes both save their year to one SQLite file."""
+        _seed_race(transformer.database, 2022, 7763, 1141, "2022-09-18")
+        _seed_race(transformer.database, 2023, 9158, 1219, "2023-09-17")
+        
+        results = transformer.save_analytics_data_years([2022, 2023], workers=2)
+        
+        assert results[2022]["grand_prix_results"] is True
+        assert results[2023]["grand_prix_results"] is True
+        saved = transformer.database.fetch_dataframe(
+            "SELECT year, COUNT(*) AS drivers FROM grand_prix_results GROUP BY year ORDER BY year"
+        )
+        assert saved["year"].tolist() == [2022, 2023]
+        assert saved["drivers"].tolist() == [3, 3]
@@ -1,15 +1,27 @@
 """Unit tests for cloud swap functionality."""
 
 import pytest
+from pathlib import Path
 from unittest.mock import MagicMock, patch
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import tempfile
 import os
 
+from f1_data_platform.cloud_swap.bulk_load import postgres_copy_insert
 from f1_data_platform.cloud_swap.factory import CloudProviderFactory, get_cloud_provider
 from f1_data_platform.cloud_swap.providers.local import LocalCloudProvider, LocalStorageProvider, LocalDatabaseProvider
 
 
+def _parquet_buffer(df):
+    """Serialize a DataFrame to an uncompressed in-memory Parquet buffer."""
+    sink = pa.BufferOutputStream()
+    pq.write_table(pa.Table.from_pandas(df), sink, compression=None)
+    return sink.getvalue()
+
+
 class TestCloudProviderFactory:
     """Test CloudProviderFactory functionality."""
     
@@ -98,26 +110,27 @@ class TestLocalStorageProvider:
         success = provider.upload_dataframe(df, "data/test.csv", format="csv")
         assert success is True
         
+        # CSV re-infers dtypes on read, so compare columns and values only
         downloaded_csv = provider.download_dataframe("data/test.csv", format="csv")
-        pd.testing.assert_frame_equal(df, downloaded_csv)
+        assert list(downloaded_csv.columns) == list(df.columns)
+        assert np.array_equal(downloaded_csv.to_numpy(), df.to_numpy())
     
     def test_list_files(self, temp_dir):
         """Test file listing functionality."""
         provider = LocalStorageProvider(temp_dir)
         
         # Create some test files
-        test_files = ["file1.txt", "dir/file2.txt", "dir/subdir/file3.txt"]
-        for file_path in test_files:
-            full_path = provider._get_full_path(file_path)
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            full_path.write_text("test")
+        base = Path(temp_dir)
+        subdir = base / "dir" / "subdir"
+        subdir.mkdir(parents=True)
+        (base / "file1.txt").write_bytes(b"test")
+        (base / "dir" / "file2.txt").write_bytes(b"test")
+        (subdir / "file3.txt").write_bytes(b"test")
         
         # List all files
         all_files = provider.list_files()
         assert len(all_files) == 3
-        assert "file1.txt" in all_files
-        assert "dir/file2.txt" in all_files
-        assert "dir/subdir/file3.txt" in all_files
+        assert set(all_files) == {"file1.txt", "dir/file2.txt", "dir/subdir/file3.txt"}
         
         # List with prefix
         dir_files = provider.list_files("dir/")
@@ -131,7 +144,7 @@ class TestLocalStorageProvider:
         # Create a test file
         test_content = "test content for size check"
         df = pd.DataFrame({"data": [test_content]})
-        provider.upload_dataframe(df, "test_file.parquet")
+        (Path(temp_dir) / "test_file.parquet").write_bytes(_parquet_buffer(df).to_pybytes())
         
         # Test file existence
         assert provider.file_exists("test_file.parquet") is True
@@ -155,6 +168,18 @@ class TestLocalStorageProvider:
 class TestLocalDatabaseProvider:
     """Test LocalDatabaseProvider functionality."""
     
+    @pytest.fixture(autouse=True)
+    def _drop_tables(self, db_provider):
+        """Drop whatever tables a test created in the shared database."""
+        yield
+        conn = db_provider.connect()
+        tables = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+        )]
+        for table in tables:
+            conn.execute(f'DROP TABLE "{table}"')
+        conn.commit()
+    
     def test_initialization(self, temp_dir):
         """Test database provider initialization."""
         db_path = os.path.join(temp_dir, "test.db")
@@ -165,8 +190,10 @@ class TestLocalDatabaseProvider:
     
     def test_connection(self, temp_dir):
         """Test database connection."""
+        # Own provider, so the lazy connect from an unconnected state is exercised
         db_path = os.path.join(temp_dir, "test.db")
         provider = LocalDatabaseProvider(db_path)
+        assert provider.connection is None
         
         conn = provider.connect()
         assert conn is not None
@@ -175,11 +202,11 @@ class TestLocalDatabaseProvider:
         # Test that subsequent calls return same connection
         conn2 = provider.connect()
         assert conn is conn2
+        provider.close()
     
-    def test_create_table(self, temp_dir):
+    def test_create_table(self, db_provider):
         """Test table creation."""
-        db_path = os.path.join(temp_dir, "test.db")
-        provider = LocalDatabaseProvider(db_path)
+        provider = db_provider
         
         schema = {
             "id": "INTEGER PRIMARY KEY",
@@ -194,10 +221,9 @@ class TestLocalDatabaseProvider:
         assert provider.table_exists("test_table") is True
         assert provider.table_exists("nonexistent_table") is False
     
-    def test_dataframe_operations(self, temp_dir):
+    def test_dataframe_operations(self, db_provider):
         """Test DataFrame insert and fetch operations."""
-        db_path = os.path.join(temp_dir, "test.db")
-        provider = LocalDatabaseProvider(db_path)
+        provider = db_provider
         
         # Create test table
         schema = {"id": "INTEGER", "name": "TEXT", "value": "REAL"}
@@ -221,10 +247,25 @@ class TestLocalDatabaseProvider:
         assert list(fetched_df.columns) == ["id", "name", "value"]
         assert fetched_df.iloc[0]["name"] == "Alice"
     
-    def test_get_table_schema(self, temp_dir):
+    def test_fetch_dataframe_chunks(self, db_provider):
+        """Test fetching query results in chunks."""
+        provider = db_provider
+        
+        df = pd.DataFrame({"id": range(10), "value": [float(i) for i in range(10)]})
+        provider.insert_dataframe(df, "chunked_data")
+        
+        chunks = list(provider.fetch_dataframe_chunks(
+            "SELECT * FROM chunked_data WHERE id >= :min_id ORDER BY id",
+            {"min_id": 2},
+            chunksize=3
+        ))
+        
+        assert [len(chunk) for chunk in chunks] == [3, 3, 2]
+        assert pd.concat(chunks)["id"].tolist() == list(range(2, 10))
+    
+    def test_get_table_schema(self, db_provider):
         """Test getting table schema."""
-        db_path = os.path.join(temp_dir, "test.db")
-        provider = LocalDatabaseProvider(db_path)
+        provider = db_provider
         
         # Create test table
         schema = {
@@ -243,6 +284,7 @@ class TestLocalDatabaseProvider:
     
     def test_close_connection(self, temp_dir):
         """Test closing database connection."""
+        # Own provider, so closing it leaves the shared db_provider connected
         db_path = os.path.join(temp_dir, "test.db")
         provider = LocalDatabaseProvider(db_path)
         
@@ -308,6 +350,30 @@ class TestLocalCloudProvider:
         assert health["compute"] is False
 
 
+class TestPostgresCopyInsert:
+    """Test the COPY-based bulk insert used by the PostgreSQL providers."""
+    
+    def test_copy_sql_and_buffer(self):
+        """Test the COPY statement and that NULLs stay distinct from empty strings."""
+        table = MagicMock()
+        table.schema = "analytics"
+        table.name = "laps"
+        conn = MagicMock()
+        cursor = conn.connection.cursor.return_value.__enter__.return_value
+        copied = {}
+        cursor.copy_expert.side_effect = lambda sql, buffer: copied.update(sql=sql, data=buffer.read())
+        
+        rows = [("a", "", None, "b"), ("c,d", None, "", 1.5)]
+        row_count = postgres_copy_insert(table, conn, ["w", "x", "y", "z"], iter(rows))
+        
+        assert row_count == 2
+        assert copied["sql"] == (
+            'COPY "analytics"."laps" ("w", "x", "y", "z") '
+            "FROM STDIN WITH (FORMAT CSV, NULL '\\N')"
+        )
+        assert copied["data"].splitlines() == ['a,,\\N,b', '"c,d",\\N,,1.5']
+
+
 @pytest.mark.aws
 class TestAWSProviderImport:
     """Test AWS provider import and initialization."""
@@ -362,5 +428,4 @@ class TestProviderIntegration:
         
         # Verify data integrity
         assert len(result_df) == 2
-        assert result_df.iloc[0]["driver_number"] == 1
-        assert result_df.iloc[1]["driver_number"] == 44
\ No newline at end of file
+        assert np.array_equal(result_df["driver_number"].to_numpy(), [1, 44])
\ No newline at end of file
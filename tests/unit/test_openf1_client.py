@@ -1,5 +1,7 @@
 """Unit tests for OpenF1 client."""
 
+import threading
+from itertools import islice
 import pytest
 from unittest.mock import MagicMock, patch
 import pandas as pd
@@ -7,6 +9,44 @@ import requests
 
 from f1_data_platform.extractors.openf1_client import OpenF1Client, APIEndpoint
 
+EXPECTED_ENDPOINTS = frozenset({
+    "meetings", "sessions", "drivers", "laps", "car_data",
+    "position", "intervals", "pit", "location", "stints",
+    "weather", "race_control", "team_radio", "overtakes",
+    "session_result", "starting_grid"
+})
+
+# Canned HTTP responses shared by the request tests; spec_set keeps tests from
+# configuring attributes a real Response doesn't have
+_FAIL = MagicMock(spec_set=requests.Response)
+_FAIL.raise_for_status.side_effect = requests.exceptions.HTTPError("Server Error")
+
+_OK = MagicMock(spec_set=requests.Response)
+_OK.raise_for_status.return_value = None
+_OK.json.return_value = {"data": "success"}
+
+
+@pytest.fixture(scope="module")
+def shared_client():
+    """Unmocked client for tests that only read its configuration."""
+    return OpenF1Client()
+
+
+@pytest.fixture
+def sleep_calls(monkeypatch):
+    """Make the client's rate-limit sleeps return immediately, recording each delay."""
+    calls = []
+    monkeypatch.setattr("f1_data_platform.extractors.openf1_client.time.sleep", calls.append)
+    return calls
+
+
+@pytest.fixture
+def openf1_client(sleep_calls):
+    """Client whose HTTP session is a mock, so tests configure responses on session.get."""
+    client = OpenF1Client()
+    client.session = MagicMock(spec=requests.Session)
+    return client
+
 
 class TestAPIEndpoint:
     """Test APIEndpoint dataclass."""
@@ -32,15 +72,13 @@ class TestAPIEndpoint:
 class TestOpenF1Client:
     """Test OpenF1Client functionality."""
     
-    def test_client_initialization(self):
+    def test_client_initialization(self, shared_client):
         """Test client initialization with default parameters."""
-        client = OpenF1Client()
-        
-        assert client.base_url == "https://api.openf1.org/v1"
-        assert client.rate_limit_delay == 0.1
-        assert client.max_retries == 3
-        assert client.timeout == 30
-        assert "User-Agent" in client.session.headers
+        assert shared_client.base_url == "https://api.openf1.org/v1"
+        assert shared_client.rate_limit_delay == 0.1
+        assert shared_client.max_retries == 3
+        assert shared_client.timeout == 30
+        assert "User-Agent" in shared_client.session.headers
     
     def test_client_initialization_custom_params(self):
         """Test client initialization with custom parameters."""
@@ -56,69 +94,60 @@ class TestOpenF1Client:
         assert client.max_retries == 5
         assert client.timeout == 60
     
-    @patch('f1_pipeline.extractors.openf1_client.time.sleep')
-    @patch('requests.Session.get')
-    def test_make_request_success(self, mock_get, mock_sleep):
+    def test_make_request_success(self, openf1_client, sleep_calls):
         """Test successful API request."""
-        # Setup mock response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"data": "test"}
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        openf1_client.session.get.return_value = _OK
         
-        client = OpenF1Client()
-        result = client._make_request("/test", {"param": "value"})
+        result = openf1_client._make_request("/test", {"param": "value"})
         
-        assert result == {"data": "test"}
-        mock_get.assert_called_once()
-        mock_sleep.assert_called_once_with(0.1)
+        assert result == {"data": "success"}
+        openf1_client.session.get.assert_called_once()
+        assert sleep_calls == [0.1]
     
-    @patch('f1_pipeline.extractors.openf1_client.time.sleep')
-    @patch('requests.Session.get')
-    def test_make_request_retry_on_failure(self, mock_get, mock_sleep):
+    def test_make_request_retry_on_failure(self, openf1_client, sleep_calls):
         """Test request retry mechanism."""
-        # Setup mock to fail twice then succeed
-        mock_response_fail = MagicMock()
-        mock_response_fail.raise_for_status.side_effect = requests.exceptions.HTTPError("Server Error")
-        
-        mock_response_success = MagicMock()
-        mock_response_success.json.return_value = {"data": "success"}
-        mock_response_success.raise_for_status.return_value = None
+        # Fail twice then succeed
+        openf1_client.session.get.side_effect = [_FAIL, _FAIL, _OK]
         
-        mock_get.side_effect = [mock_response_fail, mock_response_fail, mock_response_success]
-        
-        client = OpenF1Client(max_retries=3)
-        result = client._make_request("/test")
+        result = openf1_client._make_request("/test")
         
         assert result == {"data": "success"}
-        assert mock_get.call_count == 3
+        assert openf1_client.session.get.call_count == 3
         # Should sleep with exponential backoff
-        assert mock_sleep.call_count == 3
+        assert sleep_calls == [0.1, 0.2, 0.4]
     
-    @patch('requests.Session.get')
-    def test_make_request_exhausted_retries(self, mock_get):
-        """Test request failure after all retries exhausted."""
-        mock_response = MagicMock()
-        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("Server Error")
-        mock_get.return_value = mock_response
+    def test_worker_threads_get_own_session(self):
+        """Test that requests from other threads don't share the client's session."""
+        client = OpenF1Client()
+        sessions = []
         
-        client = OpenF1Client(max_retries=2)
+        worker = threading.Thread(target=lambda: sessions.extend([client._get_session(), client._get_session()]))
+        worker.start()
+        worker.join()
+        
+        assert client._get_session() is client.session
+        assert sessions[0] is sessions[1]
+        assert sessions[0] is not client.session
+        assert sessions[0].headers["User-Agent"] == client.session.headers["User-Agent"]
+    
+    def test_make_request_exhausted_retries(self, openf1_client):
+        """Test request failure after all retries exhausted."""
+        openf1_client.session.get.return_value = _FAIL
+        openf1_client.max_retries = 2
         
         with pytest.raises(requests.exceptions.HTTPError):
-            client._make_request("/test")
+            openf1_client._make_request("/test")
         
-        assert mock_get.call_count == 3  # Initial + 2 retries
+        assert openf1_client.session.get.call_count == 3  # Initial + 2 retries
     
-    @patch.object(OpenF1Client, '_make_request')
-    def test_get_data_as_dataframe(self, mock_make_request):
+    def test_get_data_as_dataframe(self, openf1_client):
         """Test getting data as DataFrame."""
-        mock_make_request.return_value = [
+        openf1_client.session.get.return_value.json.return_value = [
             {"id": 1, "name": "test1"},
             {"id": 2, "name": "test2"}
         ]
         
-        client = OpenF1Client()
-        result = client.get_data("meetings", as_dataframe=True)
+        result = openf1_client.get_data("meetings", as_dataframe=True)
         
         assert isinstance(result, pd.DataFrame)
         assert len(result) == 2
@@ -128,23 +157,55 @@ class TestOpenF1Client:
         assert "_endpoint" in result.columns
         assert result.iloc[0]["_endpoint"] == "meetings"
     
-    @patch.object(OpenF1Client, '_make_request')
-    def test_get_data_as_list(self, mock_make_request):
+    def test_get_data_as_list(self, openf1_client):
         """Test getting data as list."""
         mock_data = [{"id": 1, "name": "test1"}]
-        mock_make_request.return_value = mock_data
+        openf1_client.session.get.return_value.json.return_value = mock_data
         
-        client = OpenF1Client()
-        result = client.get_data("meetings", as_dataframe=False)
+        result = openf1_client.get_data("meetings", as_dataframe=False)
         
         assert result == mock_data
     
-    def test_get_data_invalid_endpoint(self):
-        """Test error for invalid endpoint."""
-        client = OpenF1Client()
+    def test_parse_json_bytes_content(self):
+        """Test that a raw bytes body is decoded with orjson."""
+        pytest.importorskip("orjson")
+        response = MagicMock(spec_set=requests.Response)
+        response.content = b'[{"meeting_key": 1219, "year": 2023}]'
+        
+        result = OpenF1Client._parse_json(response)
+        
+        assert result == [{"meeting_key": 1219, "year": 2023}]
+        response.json.assert_not_called()
+    
+    def test_records_to_dataframe_heterogeneous_records(self):
+        """Test that fields missing from the first record are kept."""
+        records = [
+            {"driver_number": 1, "lap_number": 1},
+            {"driver_number": 1, "lap_number": 2, "lap_duration": 90.5}
+        ]
+        
+        result = OpenF1Client._records_to_dataframe(records)
+        
+        assert list(result.columns) == ["driver_number", "lap_number", "lap_duration"]
+        assert pd.isna(result["lap_duration"].iloc[0])
+        assert result["lap_duration"].iloc[1] == 90.5
+    
+    def test_records_to_dataframe_list_fields(self):
+        """Test that list-valued fields come back as Python lists."""
+        records = [
+            {"lap_number": 1, "segments_sector_1": [2048, None, 2049]},
+            {"lap_number": 2, "segments_sector_1": [2049, 2049, 2051]}
+        ]
+        
+        result = OpenF1Client._records_to_dataframe(records)
         
+        assert result["segments_sector_1"].iloc[0] == [2048, None, 2049]
+        assert isinstance(result["segments_sector_1"].iloc[1], list)
+    
+    def test_get_data_invalid_endpoint(self, shared_client):
+        """Test error for invalid endpoint."""
         with pytest.raises(ValueError, match="Unknown endpoint: invalid_endpoint"):
-            client.get_data("invalid_endpoint")
+            shared_client.get_data("invalid_endpoint")
     
     @patch.object(OpenF1Client, 'get_data')
     def test_get_meetings(self, mock_get_data):
@@ -213,10 +274,10 @@ class TestOpenF1Client:
         mock_get_data.return_value = drivers_df
         
         client = OpenF1Client()
-        results = list(client.get_all_data_for_year(2023))
+        results = list(islice(client.get_all_data_for_year(2023), 2))
         
-        # Should yield meetings, sessions, and then session-specific data
-        assert len(results) >= 2  # At least meetings and sessions
+        # Should yield meetings, then sessions, before any session-specific data
+        assert len(results) == 2
         assert results[0][0] == "meetings"
         assert results[1][0] == "sessions"
         
@@ -233,7 +294,7 @@ class TestOpenF1Client:
         mock_get_all_data_for_year.side_effect = mock_generator
         
         client = OpenF1Client()
-        results = list(client.get_all_data_for_years([2022, 2023]))
+        results = list(islice(client.get_all_data_for_years([2022, 2023]), 2))
         
         # Should yield data for both years
         assert len(results) == 2
@@ -269,25 +330,19 @@ class TestOpenF1Client:
         assert "error" in result
         assert result["response_time_ms"] is None
     
-    def test_endpoints_definition(self):
+    def test_endpoints_definition(self, shared_client):
         """Test that all expected endpoints are defined."""
-        client = OpenF1Client()
-        
-        expected_endpoints = [
-            "meetings", "sessions", "drivers", "laps", "car_data",
-            "position", "intervals", "pit", "location", "stints",
-            "weather", "race_control", "team_radio", "overtakes",
-            "session_result", "starting_grid"
-        ]
-        
-        for endpoint in expected_endpoints:
-            assert endpoint in client.ENDPOINTS
-            assert isinstance(client.ENDPOINTS[endpoint], APIEndpoint)
+        assert EXPECTED_ENDPOINTS <= shared_client.ENDPOINTS.keys()
     
-    def test_endpoint_properties(self):
+    # Sorted so every xdist worker collects the same parameter order
+    @pytest.mark.parametrize("name", sorted(EXPECTED_ENDPOINTS))
+    def test_endpoint_type(self, shared_client, name):
+        """Test that each expected endpoint is an APIEndpoint."""
+        assert isinstance(shared_client.ENDPOINTS[name], APIEndpoint)
+    
+    def test_endpoint_properties(self, shared_client):
         """Test endpoint properties are properly set."""
-        client = OpenF1Client()
-        meetings_endpoint = client.ENDPOINTS["meetings"]
+        meetings_endpoint = shared_client.ENDPOINTS["meetings"]
         
         assert meetings_endpoint.name == "meetings"
         assert meetings_endpoint.url_path == "/meetings"